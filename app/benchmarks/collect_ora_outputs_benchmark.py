@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the collect_ora_outputs lambda against synthetic multi-flowcell inputs
+
+Compares the indexed lookups of collect_ora_outputs.get_decompressed_fastq_list_rows
+with the nested scans it replaced (each read scanning the file uri map and the decompressed file list).
+The indexed time per read should stay flat as the number of flowcells grows, the nested time per read grows linearly.
+
+All ingest ids are provided up front, so no Filemanager requests are made,
+but the lambda module still needs the orcabus_api_tools layer to be importable
+(the oncoanalyser_tools layer is added to the path from this repo).
+
+Usage:
+    python app/benchmarks/collect_ora_outputs_benchmark.py [--lanes 8] [--libraries 2] [--flowcells 1 2 4 8 16 32]
+"""
+
+# Standard imports
+import argparse
+import sys
+from copy import copy
+from pathlib import Path
+from timeit import timeit
+from typing import Dict, List, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent / "lambdas" / "collect_ora_outputs_py"))
+sys.path.append(str(Path(__file__).parent.parent / "layers" / "oncoanalyser_tools_layer" / "python"))
+
+# Lambda imports
+from collect_ora_outputs import get_decompressed_fastq_list_rows
+
+
+def get_synthetic_inputs(
+        num_flowcells: int,
+        num_lanes: int,
+        num_libraries: int
+) -> Tuple[List[Dict], Dict[str, List[str]], List[Dict], Dict[str, str]]:
+    """
+    One fastq (read 1 and read 2) per library, lane and flowcell
+    :return: The fastq list rows, file uri by fastq id map, decompressed file list and ingest id by s3 uri map
+    """
+    fastq_list_rows = []
+    file_uri_by_fastq_id_map = {}
+    decompressed_file_list = []
+    ingest_id_by_s3_uri = {}
+
+    for flowcell_idx in range(num_flowcells):
+        instrument_run_id = f"250101_A01052_{flowcell_idx:04d}_BH7WF5DSX7"
+        for lane in range(1, num_lanes + 1):
+            for library_idx in range(num_libraries):
+                library_id = f"L25{library_idx:05d}"
+                fastq_id = f"fqr.{flowcell_idx:04d}{lane:02d}{library_idx:04d}"
+                ora_uris = list(map(
+                    lambda read_iter_: f"s3://bucket/primary/{instrument_run_id}/Lane_{lane}/{library_id}_L{lane:03d}_R{read_iter_}_001.fastq.ora",
+                    [1, 2]
+                ))
+                fastq_list_rows.append({
+                    "rgid": f"AAAAAAAA+CCCCCCCC.{lane}.{instrument_run_id}",
+                    "rglb": library_id,
+                    "rgsm": library_id,
+                    "lane": lane,
+                    "read1FileUri": ora_uris[0],
+                    "read2FileUri": ora_uris[1],
+                })
+                file_uri_by_fastq_id_map[fastq_id] = ora_uris
+                decompressed_file_list.append({
+                    "fastqId": fastq_id,
+                    "decompressedFileUriByOraFileIngestIdList": list(map(
+                        lambda ora_uri_iter_: {
+                            "ingestId": f"ingest-{ora_uri_iter_}",
+                            "gzipFileUri": ora_uri_iter_.replace("s3://bucket/primary/", "s3://bucket/cache/").replace(".ora", ".gz"),
+                        },
+                        ora_uris
+                    ))
+                })
+                for ora_uri in ora_uris:
+                    ingest_id_by_s3_uri[ora_uri] = f"ingest-{ora_uri}"
+
+    return fastq_list_rows, file_uri_by_fastq_id_map, decompressed_file_list, ingest_id_by_s3_uri
+
+
+def get_decompressed_fastq_list_rows_nested_scan(
+        fastq_list_rows: List[Dict],
+        file_uri_by_fastq_id_map: Dict[str, List[str]],
+        decompressed_file_list: List[Dict],
+        ingest_id_by_s3_uri: Dict[str, str]
+) -> List[Dict]:
+    """
+    The nested scans used before the reverse indexes, kept here as the baseline
+    """
+    def get_gzip_file_uri(s3_uri: str, fastq_id: str) -> str:
+        for decompressed_file_obj in decompressed_file_list:
+            if not decompressed_file_obj['fastqId'] == fastq_id:
+                continue
+            for ingest_obj_iter in decompressed_file_obj['decompressedFileUriByOraFileIngestIdList']:
+                if ingest_obj_iter['ingestId'] == ingest_id_by_s3_uri[s3_uri]:
+                    return ingest_obj_iter['gzipFileUri']
+        raise ValueError(s3_uri)
+
+    new_fastq_list_rows = []
+    for fastq_list_row in fastq_list_rows:
+        new_fastq_list_row = copy(fastq_list_row)
+        fastq_id = next(
+            fastq_id_iter
+            for fastq_id_iter, file_uri_list in file_uri_by_fastq_id_map.items()
+            if fastq_list_row['read1FileUri'] in file_uri_list
+        )
+        for read_key_iter in ['read1FileUri', 'read2FileUri']:
+            new_fastq_list_row[read_key_iter] = get_gzip_file_uri(fastq_list_row[read_key_iter], fastq_id)
+        new_fastq_list_rows.append(new_fastq_list_row)
+    return new_fastq_list_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lanes", type=int, default=8)
+    parser.add_argument("--libraries", type=int, default=2)
+    parser.add_argument("--flowcells", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'flowcells':>9} {'reads':>7} {'indexed (ms)':>13} {'us / read':>10} {'nested (ms)':>12} {'us / read':>10}")
+    for num_flowcells in args.flowcells:
+        inputs = get_synthetic_inputs(num_flowcells, args.lanes, args.libraries)
+        num_reads = 2 * len(inputs[0])
+
+        # Both implementations must agree
+        if get_decompressed_fastq_list_rows(*inputs) != get_decompressed_fastq_list_rows_nested_scan(*inputs):
+            raise AssertionError("Indexed and nested scan outputs differ")
+
+        indexed_seconds = timeit(lambda: get_decompressed_fastq_list_rows(*inputs), number=args.repeats) / args.repeats
+        nested_seconds = timeit(lambda: get_decompressed_fastq_list_rows_nested_scan(*inputs), number=args.repeats) / args.repeats
+
+        print(
+            f"{num_flowcells:>9} {num_reads:>7} "
+            f"{indexed_seconds * 1e3:>13.3f} {indexed_seconds * 1e6 / num_reads:>10.2f} "
+            f"{nested_seconds * 1e3:>12.3f} {nested_seconds * 1e6 / num_reads:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
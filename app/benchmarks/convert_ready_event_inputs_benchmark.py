@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the samplesheet builder of the convert_ready_event_inputs_to_icav2_wes_event_inputs lambda
+
+Compares the plain dict samplesheet rows of the lambda with the pandas implementation it replaced
+(convert_ready_event_inputs_pandas_baseline, a verbatim copy of the original code), for
+  * startup: the time to import each module in a fresh interpreter
+  * invocation: the time to build the samplesheet for synthetic fastq and bam inputs
+
+The serialised fastq samplesheets of both implementations must be byte-identical.
+The bam samplesheets are expected to differ, the baseline never wrote the bam index rows
+(it emits each bam row twice), the lambda emits a bai row after each bam row.
+Both samplesheets are printed for the bam inputs.
+
+The lambda module needs the orcabus_api_tools layer to be importable, the pandas baseline needs pandas.
+
+Usage:
+    python app/benchmarks/convert_ready_event_inputs_benchmark.py [--rows 1 8 32 128] [--repeats 20] [--startup-repeats 5]
+"""
+
+# Standard imports
+import argparse
+import json
+import subprocess
+import sys
+from copy import deepcopy
+from pathlib import Path
+from statistics import median
+from timeit import timeit
+from typing import Dict, List
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+LAMBDA_DIR = BENCHMARKS_DIR.parent / "lambdas" / "convert_ready_event_inputs_to_icav2_wes_event_inputs_py"
+sys.path.append(str(LAMBDA_DIR))
+sys.path.append(str(BENCHMARKS_DIR))
+
+# Lambda imports
+from convert_ready_event_inputs_to_icav2_wes_event_inputs import generate_samplesheet_from_inputs
+
+
+def get_synthetic_fastq_inputs(num_rows: int) -> Dict:
+    """
+    num_rows fastq list rows for each of the normal and tumor samples, on lanes 1 to 8
+    """
+    def get_fastq_list_rows(library_id: str) -> List[Dict]:
+        return list(map(
+            lambda row_idx_iter_: {
+                "rgid": f"AAAAAAAA+CCCCCCCC.{row_idx_iter_ % 8 + 1}.250101_A01052_{row_idx_iter_ // 8:04d}_BH7WF5DSX7",
+                "rglb": library_id,
+                "rgsm": library_id,
+                "lane": row_idx_iter_ % 8 + 1,
+                "read1FileUri": f"s3://bucket/{library_id}/{row_idx_iter_:04d}_R1_001.fastq.gz",
+                "read2FileUri": f"s3://bucket/{library_id}/{row_idx_iter_:04d}_R2_001.fastq.gz",
+            },
+            range(num_rows)
+        ))
+
+    return {
+        "groupId": "SBJ00001",
+        "subjectId": "SBJ00001",
+        "normalDnaSampleId": "L2500001",
+        "tumorDnaSampleId": "L2500002",
+        "normalFastqListRows": get_fastq_list_rows("L2500001"),
+        "tumorFastqListRows": get_fastq_list_rows("L2500002"),
+    }
+
+
+def get_synthetic_bam_inputs() -> Dict:
+    return {
+        "groupId": "SBJ00001",
+        "subjectId": "SBJ00001",
+        "normalDnaSampleId": "L2500001",
+        "tumorDnaSampleId": "L2500002",
+        "normalDnaBamUri": "s3://bucket/L2500001/L2500001.bam",
+        "tumorDnaBamUri": "s3://bucket/L2500002/L2500002.bam",
+    }
+
+
+def get_import_seconds(import_statement: str, repeats: int) -> float:
+    """
+    The median time to run an import statement in a fresh interpreter
+    """
+    return median(map(
+        lambda _: float(subprocess.run(
+            [
+                sys.executable, "-c",
+                "import sys, time; "
+                f"sys.path.extend([{str(LAMBDA_DIR)!r}, {str(BENCHMARKS_DIR)!r}]); "
+                "start = time.perf_counter(); "
+                f"{import_statement}; "
+                "print(time.perf_counter() - start)"
+            ],
+            capture_output=True, text=True, check=True,
+        ).stdout),
+        range(repeats)
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--startup-repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    # Import the baseline lazily, it needs pandas
+    from convert_ready_event_inputs_pandas_baseline import (
+        generate_samplesheet_from_inputs as generate_samplesheet_from_inputs_pandas
+    )
+
+    dicts_import_seconds = get_import_seconds(
+        "import convert_ready_event_inputs_to_icav2_wes_event_inputs", args.startup_repeats
+    )
+    pandas_import_seconds = get_import_seconds(
+        "import convert_ready_event_inputs_pandas_baseline", args.startup_repeats
+    )
+    print(f"{'startup':>12} {'dicts (ms)':>12} {'pandas (ms)':>12}")
+    print(f"{'import':>12} {dicts_import_seconds * 1e3:>12.1f} {pandas_import_seconds * 1e3:>12.1f}")
+    print()
+
+    print(f"{'invocation':>12} {'rows':>6} {'dicts (ms)':>12} {'pandas (ms)':>12}")
+    for input_name, inputs in [
+        ("bam", get_synthetic_bam_inputs()),
+        *map(lambda num_rows_iter_: ("fastq", get_synthetic_fastq_inputs(num_rows_iter_)), args.rows),
+    ]:
+        dicts_samplesheet = generate_samplesheet_from_inputs(deepcopy(inputs))
+        pandas_samplesheet = generate_samplesheet_from_inputs_pandas(deepcopy(inputs))
+        if input_name == "bam":
+            # The baseline never wrote the bai rows, show the difference rather than failing on it
+            print(f"bam samplesheet filetypes, dicts: {[row['filetype'] for row in dicts_samplesheet]}")
+            print(f"bam samplesheet filetypes, pandas: {[row['filetype'] for row in pandas_samplesheet]}")
+        elif not json.dumps(dicts_samplesheet) == json.dumps(pandas_samplesheet):
+            # Each implementation gets its own copy of the inputs, the lane de-collision mutates the rows
+            raise AssertionError(f"Dict and pandas samplesheets differ for {input_name} inputs")
+
+        num_rows = len(generate_samplesheet_from_inputs(deepcopy(inputs)))
+        dicts_seconds = timeit(lambda: generate_samplesheet_from_inputs(deepcopy(inputs)), number=args.repeats) / args.repeats
+        pandas_seconds = timeit(lambda: generate_samplesheet_from_inputs_pandas(deepcopy(inputs)), number=args.repeats) / args.repeats
+
+        print(f"{input_name:>12} {num_rows:>6} {dicts_seconds * 1e3:>12.3f} {pandas_seconds * 1e3:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+
+"""
+The pandas samplesheet builder of convert_ready_event_inputs_to_icav2_wes_event_inputs,
+copied verbatim from the lambda before it moved to plain dict rows, for use as the benchmark baseline.
+
+Note this baseline never writes the bam index rows, the row.update calls in
+generate_samplesheet_from_input_bams only modify the copies of the rows that DataFrame.apply hands to the lambda,
+so bam inputs produce each bam row twice and no bai rows.
+
+Needs pandas and the orcabus_api_tools layer to be importable.
+"""
+
+# Typing imports
+from typing import List, Dict, Union, cast, Literal, TypedDict
+import pandas as pd
+
+# Layer imports
+from orcabus_api_tools.fastq.models import FastqListRowDict
+
+# Globals
+DEFAULT_MODE = "wgts"
+DEFAULT_MONOCHROME_LOGS = True
+DEFAULT_GENOME = "GRCh38_hmf"
+DEFAULT_GENOME_VERSION = "38"
+DEFAULT_GENOME_TYPE = "no_alt"
+DEFAULT_PUBLISH_DIR_MODE = "symlink"
+DEFAULT_OUTDIR = "out"
+
+DEFAULT_SAMPLESHEET_COLUMNS = [
+    "group_id",
+    "subject_id",
+    "sample_id",
+    "sample_type",
+    "sequence_type",
+    "filetype",
+    "filepath",
+]
+
+FASTQ_SAMPLESHEET_COLUMNS = [
+    *DEFAULT_SAMPLESHEET_COLUMNS.copy(),
+    "info"
+]
+
+# Models
+SampleType = Literal["normal", "tumor"]
+SequenceType = Literal["dna"]
+
+
+class ReadyEventInputsBase(TypedDict):
+    # Metadata
+    groupId: str
+    subjectId: str
+    normalDnaSampleId: str
+    tumorDnaSampleId: str
+
+
+class ReadyEventInputsFastq(ReadyEventInputsBase):
+    # FQLRs
+    normalFastqListRows: List[FastqListRowDict]
+    tumorFastqListRows: List[FastqListRowDict]
+
+
+class ReadyEventInputsBam(ReadyEventInputsBase):
+    normalDnaBamUri: str
+    tumorDnaBamUri: str
+
+
+ReadyEventInputsType = Union[ReadyEventInputsFastq, ReadyEventInputsBam]
+
+
+def generate_samplesheet_from_inputs(
+        ready_event_inputs: ReadyEventInputsType
+) -> List[Dict[str, str]]:
+    if ready_event_inputs.get('normalDnaBamUri') is not None:
+        return generate_samplesheet_from_input_bams(cast(ReadyEventInputsBam, ready_event_inputs))
+    else:
+        return generate_samplesheet_from_input_fastqs(cast(ReadyEventInputsFastq, ready_event_inputs))
+
+
+def generate_samplesheet_rows_from_fastqs(
+        group_id: str,
+        subject_id: str,
+        sample_id: str,
+        sample_type: SampleType,
+        sequence_type: SequenceType,
+        fastq_list_rows: List[FastqListRowDict],
+) -> pd.DataFrame:
+    """
+    Given a list of fastq list rows, generate a list of samplesheet rows.
+    Ensure that there are no duplicate lanes.
+    :param group_id:
+    :param subject_id:
+    :param sample_id:
+    :param sample_type:
+    :param sequence_type:
+    :param fastq_list_rows:
+    :return:
+    """
+
+    # Set lanes used
+    lanes_used = set()
+    # Set list of series
+    rows_series_list: List[pd.Series] = []
+
+    # Ensure that there are no duplicate lanes
+    for fastq_list_row_iter_ in fastq_list_rows.copy():
+        # Continue to add lane ids to the lanes_used set until we find a lane that is not in the lanes_used set
+        while fastq_list_row_iter_['lane'] in lanes_used:
+            fastq_list_row_iter_['lane'] += 1
+        # Add lane to lanes_used set
+        lanes_used.add(fastq_list_row_iter_['lane'])
+        rows_series_list.append(
+            pd.Series(
+                index=FASTQ_SAMPLESHEET_COLUMNS,
+                data={
+                    "group_id": group_id,
+                    "subject_id": subject_id,
+                    "sample_id": sample_id,
+                    "sample_type": sample_type,
+                    "sequence_type": sequence_type,
+                    "filetype": "fastq",
+                    "info": f"library_id:{fastq_list_row_iter_['rglb']};lane:{str(fastq_list_row_iter_['lane']).zfill(3)}",
+                    "filepath": ";".join(list(filter(
+                        lambda file_iter_: file_iter_ is not None,
+                        [
+                            fastq_list_row_iter_["read1FileUri"],
+                            fastq_list_row_iter_.get("read2FileUri", None),
+                        ]
+                    )))
+                }
+            )
+        )
+
+    # Return the DataFrame
+    return pd.DataFrame(rows_series_list)
+
+
+def generate_samplesheet_from_input_fastqs(
+        ready_event_inputs: ReadyEventInputsFastq
+) -> List[Dict[str, str]]:
+    samplesheet_df = pd.concat([
+        # Normal fastqs
+        generate_samplesheet_rows_from_fastqs(
+            group_id=ready_event_inputs["groupId"],
+            subject_id=ready_event_inputs["subjectId"],
+            sample_id=ready_event_inputs["normalDnaSampleId"],
+            sample_type="normal",
+            sequence_type="dna",
+            fastq_list_rows=ready_event_inputs['normalFastqListRows']
+        ),
+        # Tumor fastqs
+        generate_samplesheet_rows_from_fastqs(
+            group_id=ready_event_inputs["groupId"],
+            subject_id=ready_event_inputs["subjectId"],
+            sample_id=ready_event_inputs["tumorDnaSampleId"],
+            sample_type="tumor",
+            sequence_type="dna",
+            fastq_list_rows=ready_event_inputs['tumorFastqListRows']
+        )
+    ])
+
+    # Convert the DataFrame to a list of dictionaries
+    return cast(List[Dict[str, str]], samplesheet_df.to_dict(orient='records'))
+
+
+def generate_samplesheet_from_input_bams(
+        ready_event_inputs: ReadyEventInputsBam
+) -> List[Dict[str, str]]:
+    samplesheet_df_bams = pd.DataFrame(
+        columns=DEFAULT_SAMPLESHEET_COLUMNS,
+        data=[
+            # Normal bam
+            {
+                "group_id": ready_event_inputs["groupId"],
+                "subject_id": ready_event_inputs["subjectId"],
+                "sample_id": ready_event_inputs["normalDnaSampleId"],
+                "sample_type": "normal",
+                "sequence_type": "dna",
+                "filetype": "bam",
+                "filepath": ready_event_inputs["normalDnaBamUri"],
+            },
+            # Tumor bam
+            {
+                "group_id": ready_event_inputs["groupId"],
+                "subject_id": ready_event_inputs["subjectId"],
+                "sample_id": ready_event_inputs["tumorDnaSampleId"],
+                "sample_type": "tumor",
+                "sequence_type": "dna",
+                "filetype": "bam",
+                "filepath": ready_event_inputs["tumorDnaBamUri"],
+            },
+        ]
+    )
+
+    # Generate BAM index entries from the BAM entries
+    samplesheet_df_bam_indexes = samplesheet_df_bams.copy()
+    samplesheet_df_bam_indexes.apply(
+        lambda row: row.update({"filetype": "bai", "filepath": f"{row['filepath']}.bai"}),
+        axis='columns'
+    )
+
+    # Join the BAM and BAM index entries
+    samplesheet_df = pd.concat(
+        [samplesheet_df_bams, samplesheet_df_bam_indexes],
+        ignore_index=True
+    )
+
+    # Convert the DataFrame to a list of dictionaries
+    return cast(List[Dict[str, str]], samplesheet_df.to_dict(orient='records'))
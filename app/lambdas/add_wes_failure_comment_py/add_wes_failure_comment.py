@@ -2,15 +2,18 @@
 
 """
 The ICA analysis has failed, we add a comment to the analysis
+
+The workflow run id is read from the workflow run projection table (see update_workflow_run_projection),
+falling back to the Workflow Manager API if the run is not in the projection.
+The orcabus id of a run never changes, so an older state of the run in the projection does not matter.
 """
 
 # Standard imports
 from os import environ
 
 # Local imports
-from orcabus_api_tools.workflow import (
-    add_comment_to_workflow_run, get_workflow_run_from_portal_run_id
-)
+from orcabus_api_tools.workflow import add_comment_to_workflow_run
+from oncoanalyser_tools.workflow_run_projection import get_workflow_run
 
 # Globals
 WORKFLOW_NAME_ENV_VAR = "WORKFLOW_NAME"
@@ -30,7 +33,7 @@ def handler(event, context):
     execution_arn = event.get("executionArn", "")
 
     # Get the workflow run id from the portal run id
-    workflow_run_id = get_workflow_run_from_portal_run_id(portal_run_id)["orcabusId"]
+    workflow_run_id = get_workflow_run(portal_run_id)["orcabusId"]
 
     # Construct the comment body
     body = f"The workflow has failed with error type '{error_type}', full traceback can be found at '{error_message_uri}'"
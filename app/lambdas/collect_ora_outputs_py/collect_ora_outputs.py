@@ -73,60 +73,126 @@ And get the output
     "read2FileUri": "s3://pipeline-dev-cache-503977275616-ap-southeast-2/byob-icav2/development/cache/oncoanalyser-wgts-dna/20260509a27b96ef/230629_A01052_0154_BH7WF5DSX7/Samples/Lane_2/L2300950/L2300950_S11_L002_R2_001.fastq.gz"
   }
 ]
+
+The fastq id of each read uri and the gzip uri of each (fastq id, ingest id) pair are looked up in
+reverse indexes built once per invocation, so the cost is linear in the number of reads and files.
+
+If the decompression output carries the source ora file uri (oraFileUri) alongside each ingestId,
+the read is matched on its uri directly. The ingest ids of any remaining reads are resolved in one batched
+Filemanager query (per bucket, see oncoanalyser_tools.filemanager), rather than one request per read.
 """
 
 # Standard imports
 from copy import copy
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Union, Tuple
 
 # Layer imports
 from orcabus_api_tools.filemanager import get_ingest_id_from_s3_uri
+from oncoanalyser_tools.filemanager import get_file_objects_by_s3_uri
+
+
+def get_fastq_id_by_file_uri_map(file_uri_by_fastq_id_map: Dict[str, List[str]]) -> Dict[str, str]:
+    """
+    Reverse the fastq id to file uris map
+    :param file_uri_by_fastq_id_map:
+    :return:
+    """
+    return {
+        file_uri: fastq_id
+        for fastq_id, file_uri_list in file_uri_by_fastq_id_map.items()
+        for file_uri in file_uri_list
+    }
+
+
+def get_gzip_file_uri_by_fastq_id_and_ingest_id_map(
+        decompressed_file_list: List[Dict[str, Union[str, List[Dict[str, str]]]]]
+) -> Dict[Tuple[str, str], str]:
+    """
+    Index the decompressed files by their fastq id and the ingest id of the ora file they were decompressed from
+    :param decompressed_file_list:
+    :return:
+    """
+    return {
+        (decompressed_file_obj['fastqId'], ingest_obj_iter['ingestId']): ingest_obj_iter['gzipFileUri']
+        for decompressed_file_obj in decompressed_file_list
+        for ingest_obj_iter in decompressed_file_obj['decompressedFileUriByOraFileIngestIdList']
+    }
 
 
 def get_fastq_id_by_uri(
         file_uri: str,
-        file_uri_by_fastq_id_map: Dict[str, List[str]]
+        fastq_id_by_file_uri_map: Dict[str, str]
 ) -> str:
-    for fastq_id, file_uri_list in file_uri_by_fastq_id_map.items():
-        if file_uri in file_uri_list:
-            return fastq_id
-    raise ValueError(f"Cannot find {file_uri} in file uri map")
+    try:
+        return fastq_id_by_file_uri_map[file_uri]
+    except KeyError:
+        raise ValueError(f"Cannot find {file_uri} in file uri map")
+
+
+def get_gzip_file_uri_by_fastq_id_and_ora_file_uri_map(
+        decompressed_file_list: List[Dict[str, Union[str, List[Dict[str, str]]]]]
+) -> Dict[Tuple[str, str], str]:
+    """
+    Index the decompressed files by their fastq id and the uri of the ora file they were decompressed from,
+    for decompression outputs that carry the source ora file uri (oraFileUri) alongside the ingest id.
+    These reads need no ingest id lookup.
+    :param decompressed_file_list:
+    :return:
+    """
+    return {
+        (decompressed_file_obj['fastqId'], ingest_obj_iter['oraFileUri']): ingest_obj_iter['gzipFileUri']
+        for decompressed_file_obj in decompressed_file_list
+        for ingest_obj_iter in decompressed_file_obj['decompressedFileUriByOraFileIngestIdList']
+        if ingest_obj_iter.get('oraFileUri') is not None
+    }
 
 
 def get_decompressed_file_from_s3_uri_and_fastq_id(
         s3_uri: str,
         fastq_id: str,
-        decompressed_file_list: List[Dict[str, Union[str, List[Dict[str, str]]]]],
+        gzip_file_uri_by_fastq_id_and_ora_file_uri_map: Dict[Tuple[str, str], str],
+        gzip_file_uri_by_fastq_id_and_ingest_id_map: Dict[Tuple[str, str], str],
+        ingest_id_by_s3_uri: Dict[str, str],
 ) -> str:
-    # Get the ingest id from the s3 uri
-    ingest_id = get_ingest_id_from_s3_uri(s3_uri)
+    # Use the source ora file uri if the decompression output carries it
+    if (fastq_id, s3_uri) in gzip_file_uri_by_fastq_id_and_ora_file_uri_map:
+        return gzip_file_uri_by_fastq_id_and_ora_file_uri_map[(fastq_id, s3_uri)]
 
-    for decompressed_file_obj in decompressed_file_list:
-        if not decompressed_file_obj['fastqId'] == fastq_id:
-            continue
-        for ingest_obj_iter in decompressed_file_obj['decompressedFileUriByOraFileIngestIdList']:
-            if not ingest_obj_iter['ingestId'] == ingest_id:
-                continue
-            return ingest_obj_iter['gzipFileUri']
-    raise ValueError(f"Cannot find decompressed file for s3 uri {s3_uri} and fastq id {fastq_id} in decompressed file list")
+    # Get the ingest id from the s3 uri, falling back to a single lookup if the bulk query missed it
+    ingest_id = ingest_id_by_s3_uri.get(s3_uri)
+    if ingest_id is None:
+        ingest_id = get_ingest_id_from_s3_uri(s3_uri)
 
+    try:
+        return gzip_file_uri_by_fastq_id_and_ingest_id_map[(fastq_id, ingest_id)]
+    except KeyError:
+        raise ValueError(f"Cannot find decompressed file for s3 uri {s3_uri} and fastq id {fastq_id} in decompressed file list")
 
-def handler(event, context):
+
+def get_decompressed_fastq_list_rows(
+        fastq_list_rows: List[Dict],
+        file_uri_by_fastq_id_map: Dict[str, List[str]],
+        decompressed_file_list: List[Dict[str, Union[str, List[Dict[str, str]]]]],
+        ingest_id_by_s3_uri: Optional[Dict[str, str]] = None
+) -> List[Dict]:
     """
-    Given the new extracted file paths, collect each of the outputs
-    :param event:
-    :param context:
+    Point the read file uris of each fastq list row at their decompressed gzip files.
+
+    The reverse indexes are built once, each read is then a constant time lookup.
+    :param fastq_list_rows:
+    :param file_uri_by_fastq_id_map:
+    :param decompressed_file_list:
+    :param ingest_id_by_s3_uri: The ingest id of each read uri (any missing are looked up one at a time)
     :return:
     """
-
-    # Collect the inputs
-    file_uri_by_fastq_id_map = event.get("fileUriByFastqIdMap")
-    fastq_list_rows = event.get("fastqListRows")
-    decompressed_file_list = event.get("decompressedFileList")
-
-    # Check all inputs are not none
-    if file_uri_by_fastq_id_map is None or fastq_list_rows is None or decompressed_file_list is None:
-        raise ValueError("Error! all of fileUriByFastqIdMap, fastqListRows and decompressedFileList must be valid inputs")
+    fastq_id_by_file_uri_map = get_fastq_id_by_file_uri_map(file_uri_by_fastq_id_map)
+    gzip_file_uri_by_fastq_id_and_ora_file_uri_map = get_gzip_file_uri_by_fastq_id_and_ora_file_uri_map(
+        decompressed_file_list
+    )
+    gzip_file_uri_by_fastq_id_and_ingest_id_map = get_gzip_file_uri_by_fastq_id_and_ingest_id_map(
+        decompressed_file_list
+    )
+    ingest_id_by_s3_uri = ingest_id_by_s3_uri if ingest_id_by_s3_uri is not None else {}
 
     # Iterate over each fastq list row
     new_fastq_list_rows = []
@@ -135,26 +201,78 @@ def handler(event, context):
         new_fastq_list_row = copy(fastq_list_row)
 
         # Collect the fastq id
-        fastq_id = get_fastq_id_by_uri(fastq_list_row['read1FileUri'], file_uri_by_fastq_id_map)
+        fastq_id = get_fastq_id_by_uri(fastq_list_row['read1FileUri'], fastq_id_by_file_uri_map)
 
         # Create new read1FileUri from the cache dir
         new_fastq_list_row['read1FileUri'] = get_decompressed_file_from_s3_uri_and_fastq_id(
             fastq_list_row['read1FileUri'],
             fastq_id,
-            decompressed_file_list
+            gzip_file_uri_by_fastq_id_and_ora_file_uri_map,
+            gzip_file_uri_by_fastq_id_and_ingest_id_map,
+            ingest_id_by_s3_uri
         )
 
-        # Create new read1FileUri from the cache dir
+        # Create new read2FileUri from the cache dir
         if 'read2FileUri' in fastq_list_row:
             new_fastq_list_row['read2FileUri'] = get_decompressed_file_from_s3_uri_and_fastq_id(
                 fastq_list_row['read2FileUri'],
                 fastq_id,
-                decompressed_file_list
+                gzip_file_uri_by_fastq_id_and_ora_file_uri_map,
+                gzip_file_uri_by_fastq_id_and_ingest_id_map,
+                ingest_id_by_s3_uri
             )
 
         # Append to list
         new_fastq_list_rows.append(new_fastq_list_row)
 
+    return new_fastq_list_rows
+
+
+def handler(event, context):
+    """
+    Given the new extracted file paths, collect each of the outputs
+    :param event:
+    :param context:
+    :return:
+    """
+
+    # Collect the inputs
+    file_uri_by_fastq_id_map = event.get("fileUriByFastqIdMap")
+    fastq_list_rows = event.get("fastqListRows")
+    decompressed_file_list = event.get("decompressedFileList")
+
+    # Check all inputs are not none
+    if file_uri_by_fastq_id_map is None or fastq_list_rows is None or decompressed_file_list is None:
+        raise ValueError("Error! all of fileUriByFastqIdMap, fastqListRows and decompressedFileList must be valid inputs")
+
+    # Resolve the ingest ids of the read files whose source ora file uri
+    # is not carried by the decompression output, in one batched query
+    fastq_id_by_file_uri_map = get_fastq_id_by_file_uri_map(file_uri_by_fastq_id_map)
+    gzip_file_uri_by_fastq_id_and_ora_file_uri_map = get_gzip_file_uri_by_fastq_id_and_ora_file_uri_map(
+        decompressed_file_list
+    )
+    file_object_by_s3_uri = get_file_objects_by_s3_uri(list(filter(
+        lambda file_uri_iter_: (
+            file_uri_iter_ is not None and
+            (fastq_id_by_file_uri_map.get(file_uri_iter_), file_uri_iter_) not in gzip_file_uri_by_fastq_id_and_ora_file_uri_map
+        ),
+        [
+            fastq_list_row_iter_.get(read_key_iter_)
+            for fastq_list_row_iter_ in fastq_list_rows
+            for read_key_iter_ in ['read1FileUri', 'read2FileUri']
+        ]
+    )))
+    ingest_id_by_s3_uri = {
+        s3_uri: file_object['ingestId']
+        for s3_uri, file_object in file_object_by_s3_uri.items()
+        if file_object.get('ingestId') is not None
+    }
+
     return {
-        "fastqListRows": new_fastq_list_rows
+        "fastqListRows": get_decompressed_fastq_list_rows(
+            fastq_list_rows,
+            file_uri_by_fastq_id_map,
+            decompressed_file_list,
+            ingest_id_by_s3_uri
+        )
     }
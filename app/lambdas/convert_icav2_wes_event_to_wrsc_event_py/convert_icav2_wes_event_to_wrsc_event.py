@@ -5,6 +5,12 @@ Given the outputs of an icav2 wes event, convert to a wrsc event
 
 If the workflow has succeeded, we need to generate the dnaOncoanalyserAnalysisRelPath
 which is just the groupId from the event inputs.
+
+The workflow run is read from the workflow run projection table (see update_workflow_run_projection),
+falling back to the Workflow Manager API if the run is not in the projection.
+Only the fields of the run that are fixed once the run is READY are used
+(orcabusId, workflow, workflowRunName, libraries), a run still DRAFT in the projection is read from the API.
+The payload is always read from the Workflow Manager API.
 """
 
 # Standard imports
@@ -12,10 +18,12 @@ from copy import deepcopy
 from datetime import datetime, timezone
 
 # Layer helpers
-from orcabus_api_tools.workflow import (
-    get_latest_payload_from_workflow_run,
-    get_workflow_run_from_portal_run_id
-)
+from orcabus_api_tools.workflow import get_latest_payload_from_workflow_run
+from oncoanalyser_tools.workflow_run_projection import get_workflow_run
+
+# Globals
+# The libraries of a run may still change while it is a draft
+DRAFT_STATUS_LIST = ['DRAFT']
 
 
 def handler(event, context):
@@ -36,7 +44,7 @@ def handler(event, context):
     portal_run_id = icav2_wes_event['tags']['portalRunId']
 
     # Get the workflow run using the portal run ID
-    workflow_run = get_workflow_run_from_portal_run_id(portal_run_id)
+    workflow_run = get_workflow_run(portal_run_id, fallback_status_list=DRAFT_STATUS_LIST)
 
     # Get the latest payload from the workflow run
     latest_payload = get_latest_payload_from_workflow_run(workflow_run['orcabusId'])
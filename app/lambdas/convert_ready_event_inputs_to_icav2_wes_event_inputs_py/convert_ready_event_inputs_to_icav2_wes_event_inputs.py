@@ -99,11 +99,28 @@ To generate an output like the following
         }
     }
 }
+
+Rather than the normal and tumor DNA fields, the inputs may list any number of samples (tumor-only, multi-tumor, DNA + RNA),
+each with its own sample type, sequence type and either a bam uri or fastq list rows:
+
+{
+    "mode": "wgts",
+    "groupId": "SBJ05828",
+    "subjectId": "SBJ05828",
+    "samples": [
+        {"sampleId": "L2401541", "sampleType": "tumor", "sequenceType": "dna", "bamUri": "s3://path/to/tumor_bam"},
+        {"sampleId": "L2401542", "sampleType": "tumor", "sequenceType": "rna", "fastqListRows": [...]}
+    ],
+    ...
+}
+
+Fastq inputs from more than one flowcell may share lanes, each fastq list row of a sample is given a unique samplesheet lane
+(see get_samplesheet_lanes). The mapping from each rgid (flowcell and lane) to its samplesheet lane is returned
+as samplesheetLaneAssignments, for the WES event tags.
 """
 
 # Typing imports
-from typing import List, Dict, Union, cast, Literal, TypedDict
-import pandas as pd
+from typing import List, Dict, Optional, Union, cast, Literal, TypedDict, NotRequired
 
 # Layer imports
 from orcabus_api_tools.fastq.models import FastqListRowDict
@@ -134,7 +151,28 @@ FASTQ_SAMPLESHEET_COLUMNS = [
 
 # Models
 SampleType = Literal["normal", "tumor"]
-SequenceType = Literal["dna"]
+SequenceType = Literal["dna", "rna"]
+FileType = Literal["bam", "bai", "fastq"]
+
+
+class SamplesheetRow(TypedDict):
+    # Keys are kept in samplesheet column order
+    group_id: str
+    subject_id: str
+    sample_id: str
+    sample_type: SampleType
+    sequence_type: SequenceType
+    filetype: FileType
+    filepath: str
+    info: NotRequired[str]
+
+
+class SamplesheetLaneAssignment(TypedDict):
+    sampleId: str
+    rgid: str
+    instrumentRunId: str
+    lane: int
+    samplesheetLane: int
 
 
 class ReadyEventInputsBase(TypedDict):
@@ -156,16 +194,184 @@ class ReadyEventInputsBam(ReadyEventInputsBase):
     tumorDnaBamUri: str
 
 
-ReadyEventInputsType = Union[ReadyEventInputsFastq, ReadyEventInputsBam]
+class Sample(TypedDict):
+    sampleId: str
+    sampleType: SampleType
+    sequenceType: SequenceType
+    # One of bamUri or fastqListRows
+    bamUri: NotRequired[str]
+    fastqListRows: NotRequired[List[FastqListRowDict]]
+
+
+class ReadyEventInputsSamples(TypedDict):
+    # Metadata
+    groupId: str
+    subjectId: str
+    samples: List[Sample]
+
+
+ReadyEventInputsType = Union[ReadyEventInputsFastq, ReadyEventInputsBam, ReadyEventInputsSamples]
+
+
+def get_samples_from_inputs(ready_event_inputs: ReadyEventInputsType) -> List[Sample]:
+    """
+    Get the samples of the inputs, either the samples list or the normal and tumor DNA samples
+    :param ready_event_inputs:
+    :return:
+    """
+    if ready_event_inputs.get('samples') is not None:
+        samples = cast(ReadyEventInputsSamples, ready_event_inputs)['samples']
+    elif ready_event_inputs.get('normalDnaBamUri') is not None:
+        ready_event_inputs = cast(ReadyEventInputsBam, ready_event_inputs)
+        samples = [
+            {
+                "sampleId": ready_event_inputs["normalDnaSampleId"],
+                "sampleType": "normal",
+                "sequenceType": "dna",
+                "bamUri": ready_event_inputs["normalDnaBamUri"],
+            },
+            {
+                "sampleId": ready_event_inputs["tumorDnaSampleId"],
+                "sampleType": "tumor",
+                "sequenceType": "dna",
+                "bamUri": ready_event_inputs["tumorDnaBamUri"],
+            },
+        ]
+    else:
+        ready_event_inputs = cast(ReadyEventInputsFastq, ready_event_inputs)
+        samples = [
+            {
+                "sampleId": ready_event_inputs["normalDnaSampleId"],
+                "sampleType": "normal",
+                "sequenceType": "dna",
+                "fastqListRows": ready_event_inputs["normalFastqListRows"],
+            },
+            {
+                "sampleId": ready_event_inputs["tumorDnaSampleId"],
+                "sampleType": "tumor",
+                "sequenceType": "dna",
+                "fastqListRows": ready_event_inputs["tumorFastqListRows"],
+            },
+        ]
+
+    # Check each sample has exactly one file set
+    for sample in samples:
+        if (sample.get('bamUri') is None) == (sample.get('fastqListRows') is None):
+            raise ValueError(f"Sample {sample['sampleId']} must have exactly one of bamUri or fastqListRows")
+
+    return samples
 
 
 def generate_samplesheet_from_inputs(
         ready_event_inputs: ReadyEventInputsType
-) -> List[Dict[str, str]]:
-    if ready_event_inputs.get('normalDnaBamUri') is not None:
-        return generate_samplesheet_from_input_bams(cast(ReadyEventInputsBam, ready_event_inputs))
-    else:
-        return generate_samplesheet_from_input_fastqs(cast(ReadyEventInputsFastq, ready_event_inputs))
+) -> List[SamplesheetRow]:
+    return generate_samplesheet_from_samples(
+        group_id=ready_event_inputs["groupId"],
+        subject_id=ready_event_inputs["subjectId"],
+        samples=get_samples_from_inputs(ready_event_inputs),
+    )
+
+
+def generate_samplesheet_row(
+        group_id: str,
+        subject_id: str,
+        sample_id: str,
+        sample_type: SampleType,
+        sequence_type: SequenceType,
+        filetype: FileType,
+        filepath: str,
+) -> SamplesheetRow:
+    return {
+        "group_id": group_id,
+        "subject_id": subject_id,
+        "sample_id": sample_id,
+        "sample_type": sample_type,
+        "sequence_type": sequence_type,
+        "filetype": filetype,
+        "filepath": filepath,
+    }
+
+
+def get_instrument_run_id_from_rgid(rgid: str) -> str:
+    # rgids are <index>.<lane>.<instrument run id>
+    return rgid.split(".", 2)[-1]
+
+
+def get_samplesheet_lanes(fastq_list_rows: List[FastqListRowDict]) -> List[int]:
+    """
+    Assign each fastq list row of a sample a unique samplesheet lane, without modifying the fastq list rows.
+
+    Rows are assigned in (instrument run id, lane, rgid) order, so the assignment does not depend on the input order,
+    and each row takes the lowest free lane at or above its own lane.
+    The rows of a single flowcell keep their lanes, the lanes of each further flowcell are shifted past those already taken.
+
+    The next free lane is found through a path-compressed map of taken lanes to the next lane to try,
+    so the assignment is O(n log n) overall (dominated by the sort) rather than quadratic in the number of colliding lanes.
+    :param fastq_list_rows:
+    :return: The samplesheet lane of each fastq list row, in the order of the fastq list rows
+    """
+    next_lane_by_taken_lane: Dict[int, int] = {}
+
+    def get_next_free_lane(lane: int) -> int:
+        free_lane = lane
+        while free_lane in next_lane_by_taken_lane:
+            free_lane = next_lane_by_taken_lane[free_lane]
+        # Point every lane on the path straight at the free lane
+        while lane != free_lane:
+            next_lane_by_taken_lane[lane], lane = free_lane, next_lane_by_taken_lane[lane]
+        return free_lane
+
+    samplesheet_lanes: List[Optional[int]] = [None] * len(fastq_list_rows)
+    for row_idx in sorted(
+            range(len(fastq_list_rows)),
+            key=lambda row_idx_iter_: (
+                get_instrument_run_id_from_rgid(fastq_list_rows[row_idx_iter_]['rgid']),
+                fastq_list_rows[row_idx_iter_]['lane'],
+                fastq_list_rows[row_idx_iter_]['rgid'],
+                row_idx_iter_,
+            )
+    ):
+        samplesheet_lane = get_next_free_lane(fastq_list_rows[row_idx]['lane'])
+        next_lane_by_taken_lane[samplesheet_lane] = samplesheet_lane + 1
+        samplesheet_lanes[row_idx] = samplesheet_lane
+
+    return cast(List[int], samplesheet_lanes)
+
+
+def get_samplesheet_lane_assignments(
+        sample_id: str,
+        fastq_list_rows: List[FastqListRowDict],
+) -> List[SamplesheetLaneAssignment]:
+    """
+    Map the (flowcell, lane) of each fastq list row of a sample to its samplesheet lane
+    :param sample_id:
+    :param fastq_list_rows:
+    :return:
+    """
+    return list(map(
+        lambda row_and_lane_iter_: {
+            "sampleId": sample_id,
+            "rgid": row_and_lane_iter_[0]['rgid'],
+            "instrumentRunId": get_instrument_run_id_from_rgid(row_and_lane_iter_[0]['rgid']),
+            "lane": row_and_lane_iter_[0]['lane'],
+            "samplesheetLane": row_and_lane_iter_[1],
+        },
+        zip(fastq_list_rows, get_samplesheet_lanes(fastq_list_rows))
+    ))
+
+
+def get_samplesheet_lane_assignments_from_inputs(
+        ready_event_inputs: ReadyEventInputsType
+) -> List[SamplesheetLaneAssignment]:
+    return [
+        samplesheet_lane_assignment
+        for sample in get_samples_from_inputs(ready_event_inputs)
+        if sample.get('fastqListRows') is not None
+        for samplesheet_lane_assignment in get_samplesheet_lane_assignments(
+            sample['sampleId'],
+            sample['fastqListRows']
+        )
+    ]
 
 
 def generate_samplesheet_rows_from_fastqs(
@@ -175,10 +381,10 @@ def generate_samplesheet_rows_from_fastqs(
         sample_type: SampleType,
         sequence_type: SequenceType,
         fastq_list_rows: List[FastqListRowDict],
-) -> pd.DataFrame:
+) -> List[SamplesheetRow]:
     """
     Given a list of fastq list rows, generate a list of samplesheet rows.
-    Ensure that there are no duplicate lanes.
+    Ensure that there are no duplicate lanes (see get_samplesheet_lanes).
     :param group_id:
     :param subject_id:
     :param sample_id:
@@ -187,117 +393,111 @@ def generate_samplesheet_rows_from_fastqs(
     :param fastq_list_rows:
     :return:
     """
-
-    # Set lanes used
-    lanes_used = set()
-    # Set list of series
-    rows_series_list: List[pd.Series] = []
-
-    # Ensure that there are no duplicate lanes
-    for fastq_list_row_iter_ in fastq_list_rows.copy():
-        # Continue to add lane ids to the lanes_used set until we find a lane that is not in the lanes_used set
-        while fastq_list_row_iter_['lane'] in lanes_used:
-            fastq_list_row_iter_['lane'] += 1
-        # Add lane to lanes_used set
-        lanes_used.add(fastq_list_row_iter_['lane'])
-        rows_series_list.append(
-            pd.Series(
-                index=FASTQ_SAMPLESHEET_COLUMNS,
-                data={
-                    "group_id": group_id,
-                    "subject_id": subject_id,
-                    "sample_id": sample_id,
-                    "sample_type": sample_type,
-                    "sequence_type": sequence_type,
-                    "filetype": "fastq",
-                    "info": f"library_id:{fastq_list_row_iter_['rglb']};lane:{str(fastq_list_row_iter_['lane']).zfill(3)}",
-                    "filepath": ";".join(list(filter(
-                        lambda file_iter_: file_iter_ is not None,
-                        [
-                            fastq_list_row_iter_["read1FileUri"],
-                            fastq_list_row_iter_.get("read2FileUri", None),
-                        ]
-                    )))
-                }
-            )
-        )
-
-    # Return the DataFrame
-    return pd.DataFrame(rows_series_list)
-
-
-def generate_samplesheet_from_input_fastqs(
-        ready_event_inputs: ReadyEventInputsFastq
-) -> List[Dict[str, str]]:
-    samplesheet_df = pd.concat([
-        # Normal fastqs
-        generate_samplesheet_rows_from_fastqs(
-            group_id=ready_event_inputs["groupId"],
-            subject_id=ready_event_inputs["subjectId"],
-            sample_id=ready_event_inputs["normalDnaSampleId"],
-            sample_type="normal",
-            sequence_type="dna",
-            fastq_list_rows=ready_event_inputs['normalFastqListRows']
-        ),
-        # Tumor fastqs
-        generate_samplesheet_rows_from_fastqs(
-            group_id=ready_event_inputs["groupId"],
-            subject_id=ready_event_inputs["subjectId"],
-            sample_id=ready_event_inputs["tumorDnaSampleId"],
-            sample_type="tumor",
-            sequence_type="dna",
-            fastq_list_rows=ready_event_inputs['tumorFastqListRows']
-        )
-    ])
-
-    # Convert the DataFrame to a list of dictionaries
-    return cast(List[Dict[str, str]], samplesheet_df.to_dict(orient='records'))
+    return list(map(
+        lambda row_and_lane_iter_: cast(SamplesheetRow, {
+            **generate_samplesheet_row(
+                group_id=group_id,
+                subject_id=subject_id,
+                sample_id=sample_id,
+                sample_type=sample_type,
+                sequence_type=sequence_type,
+                filetype="fastq",
+                filepath=";".join(list(filter(
+                    lambda file_iter_: file_iter_ is not None,
+                    [
+                        row_and_lane_iter_[0]["read1FileUri"],
+                        row_and_lane_iter_[0].get("read2FileUri", None),
+                    ]
+                ))),
+            ),
+            "info": f"library_id:{row_and_lane_iter_[0]['rglb']};lane:{str(row_and_lane_iter_[1]).zfill(3)}",
+        }),
+        zip(fastq_list_rows, get_samplesheet_lanes(fastq_list_rows))
+    ))
 
 
-def generate_samplesheet_from_input_bams(
-        ready_event_inputs: ReadyEventInputsBam
-) -> List[Dict[str, str]]:
-    samplesheet_df_bams = pd.DataFrame(
-        columns=DEFAULT_SAMPLESHEET_COLUMNS,
-        data=[
-            # Normal bam
-            {
-                "group_id": ready_event_inputs["groupId"],
-                "subject_id": ready_event_inputs["subjectId"],
-                "sample_id": ready_event_inputs["normalDnaSampleId"],
-                "sample_type": "normal",
-                "sequence_type": "dna",
-                "filetype": "bam",
-                "filepath": ready_event_inputs["normalDnaBamUri"],
-            },
-            # Tumor bam
-            {
-                "group_id": ready_event_inputs["groupId"],
-                "subject_id": ready_event_inputs["subjectId"],
-                "sample_id": ready_event_inputs["tumorDnaSampleId"],
-                "sample_type": "tumor",
-                "sequence_type": "dna",
-                "filetype": "bam",
-                "filepath": ready_event_inputs["tumorDnaBamUri"],
-            },
-        ]
+def generate_samplesheet_rows_from_bam(
+        group_id: str,
+        subject_id: str,
+        sample_id: str,
+        sample_type: SampleType,
+        sequence_type: SequenceType,
+        bam_uri: str,
+) -> List[SamplesheetRow]:
+    """
+    Given a bam uri, generate the bam samplesheet row and its bam index row
+    :param group_id:
+    :param subject_id:
+    :param sample_id:
+    :param sample_type:
+    :param sequence_type:
+    :param bam_uri:
+    :return:
+    """
+    samplesheet_row_bam = generate_samplesheet_row(
+        group_id=group_id,
+        subject_id=subject_id,
+        sample_id=sample_id,
+        sample_type=sample_type,
+        sequence_type=sequence_type,
+        filetype="bam",
+        filepath=bam_uri,
     )
 
-    # Generate BAM index entries from the BAM entries
-    samplesheet_df_bam_indexes = samplesheet_df_bams.copy()
-    samplesheet_df_bam_indexes.apply(
-        lambda row: row.update({"filetype": "bai", "filepath": f"{row['filepath']}.bai"}),
-        axis='columns'
-    )
+    return [
+        samplesheet_row_bam,
+        cast(SamplesheetRow, {
+            **samplesheet_row_bam,
+            "filetype": "bai",
+            "filepath": f"{bam_uri}.bai"
+        }),
+    ]
 
-    # Join the BAM and BAM index entries
-    samplesheet_df = pd.concat(
-        [samplesheet_df_bams, samplesheet_df_bam_indexes],
-        ignore_index=True
-    )
 
-    # Convert the DataFrame to a list of dictionaries
-    return cast(List[Dict[str, str]], samplesheet_df.to_dict(orient='records'))
+def generate_samplesheet_from_samples(
+        group_id: str,
+        subject_id: str,
+        samples: List[Sample],
+) -> List[SamplesheetRow]:
+    """
+    Generate the samplesheet rows for a list of samples, each with its own sample type, sequence type and files.
+    This covers tumor / normal, tumor-only, multi-tumor and DNA + RNA sample groups.
+
+    The bam and fastq rows are listed in sample order, followed by the bam index rows (in sample order).
+    :param group_id:
+    :param subject_id:
+    :param samples:
+    :return:
+    """
+    samplesheet_rows: List[SamplesheetRow] = []
+    samplesheet_rows_bam_indexes: List[SamplesheetRow] = []
+
+    for sample in samples:
+        if sample.get('bamUri') is not None:
+            samplesheet_row_bam, samplesheet_row_bam_index = generate_samplesheet_rows_from_bam(
+                group_id=group_id,
+                subject_id=subject_id,
+                sample_id=sample['sampleId'],
+                sample_type=sample['sampleType'],
+                sequence_type=sample['sequenceType'],
+                bam_uri=sample['bamUri'],
+            )
+            samplesheet_rows.append(samplesheet_row_bam)
+            samplesheet_rows_bam_indexes.append(samplesheet_row_bam_index)
+        else:
+            samplesheet_rows.extend(generate_samplesheet_rows_from_fastqs(
+                group_id=group_id,
+                subject_id=subject_id,
+                sample_id=sample['sampleId'],
+                sample_type=sample['sampleType'],
+                sequence_type=sample['sequenceType'],
+                fastq_list_rows=sample['fastqListRows'],
+            ))
+
+    return [
+        *samplesheet_rows,
+        *samplesheet_rows_bam_indexes,
+    ]
 
 
 def genome_keys_to_snake_case(genome: Dict[str, str]) -> Dict[str, str]:
@@ -347,5 +547,7 @@ def handler(event, context):
                     else None
                 )
             }.items()
-        ))
+        )),
+        # Traceability of the samplesheet lanes back to the fastq list rows, added to the WES event tags
+        "samplesheetLaneAssignments": get_samplesheet_lane_assignments_from_inputs(ready_event_inputs),
     }
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+
+"""
+Find the ORA files that have already been decompressed into the cache prefix
+
+Re-submitted (or resolved and re-run) workflows write their decompressed outputs to the same cache prefix,
+so any fastq whose gzip outputs are already there does not need to be decompressed again.
+
+{
+  "fastqIdList": ["fqr.01JN25MRV2622KBD073XGKVYQP"],
+  "fileUriByFastqIdMap": {
+    "fqr.01JN25MRV2622KBD073XGKVYQP": [
+      "s3://test-data-503977275616-ap-southeast-2/testdata/input/fastq/L2300950/L2300950_S11_L002_R1_001.fastq.ora",
+      "s3://test-data-503977275616-ap-southeast-2/testdata/input/fastq/L2300950/L2300950_S11_L002_R2_001.fastq.ora"
+    ]
+  },
+  "cacheUri": "s3://pipeline-dev-cache-503977275616-ap-southeast-2/byob-icav2/development/cache/oncoanalyser-wgts-dna/20260509a27b96ef/"
+}
+
+Output
+
+{
+  "decompressedFileList": [
+    {
+      "fastqId": "fqr.01JN25MRV2622KBD073XGKVYQP",
+      "decompressedFileUriByOraFileIngestIdList": [
+        {
+          "ingestId": "0194d7a8-4a6a-7210-8ee9-9075cd1e24f6",
+          "oraFileUri": "s3://test-data-503977275616-ap-southeast-2/testdata/input/fastq/L2300950/L2300950_S11_L002_R1_001.fastq.ora",
+          "gzipFileUri": "s3://pipeline-dev-cache-503977275616-ap-southeast-2/byob-icav2/development/cache/oncoanalyser-wgts-dna/20260509a27b96ef/230629_A01052_0154_BH7WF5DSX7/Samples/Lane_2/L2300950/L2300950_S11_L002_R1_001.fastq.gz"
+        },
+        ...
+      ]
+    }
+  ],
+  "missingFastqIdList": [],
+  "missingFileUriByFastqIdMap": {}
+}
+
+A gzip file in the cache prefix is a hit for an ORA file if its name matches the ORA file name (with .gz in place of .ora),
+it sits under the instrument run id of the fastq, and its size matches the gzip size
+the fastq manager has recorded for the ORA file's ingest id.
+If the gzip size has not been recorded, any non-empty file is accepted.
+
+A fastq is only reused if all of its ORA files are hits, every other fastq is returned as missing.
+The cache prefix is listed once per invocation.
+"""
+
+# Standard imports
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, TypedDict
+from urllib.parse import urlparse
+
+# Layer imports
+from orcabus_api_tools.fastq import get_fastq
+from orcabus_api_tools.fastq.models import Fastq
+from orcabus_api_tools.filemanager import get_file_manager_request_response_results
+from orcabus_api_tools.filemanager.models import FileObject
+
+# Globals
+MAX_CONCURRENCY = 8
+
+
+class DecompressedFileUriByOraFileIngestId(TypedDict):
+    ingestId: str
+    oraFileUri: str
+    gzipFileUri: str
+
+
+class DecompressedFile(TypedDict):
+    fastqId: str
+    decompressedFileUriByOraFileIngestIdList: List[DecompressedFileUriByOraFileIngestId]
+
+
+def get_cached_gzip_file_objects(cache_uri: str) -> List[FileObject]:
+    """
+    List the current gzip files under the cache prefix
+    :param cache_uri:
+    :return:
+    """
+    parsed = urlparse(cache_uri)
+    return list(filter(
+        lambda file_object_iter_: file_object_iter_['key'].endswith(".gz"),
+        get_file_manager_request_response_results(
+            endpoint="api/v1/s3",
+            params={
+                "bucket": parsed.netloc,
+                "key": f"{parsed.path.lstrip('/')}*",
+                "currentState": "true",
+            }
+        )
+    ))
+
+
+def get_gzip_file_name_from_ora_file_uri(ora_file_uri: str) -> str:
+    return Path(urlparse(ora_file_uri).path).name.removesuffix(".ora") + ".gz"
+
+
+def get_read_file_obj_by_s3_uri(fastq_obj: Fastq) -> Dict[str, Dict]:
+    """
+    Index the read files of a fastq by their s3 uri
+    :param fastq_obj:
+    :return:
+    """
+    return dict(map(
+        lambda read_file_obj_iter_: (read_file_obj_iter_['s3Uri'], read_file_obj_iter_),
+        filter(
+            lambda read_file_obj_iter_: read_file_obj_iter_ is not None and read_file_obj_iter_.get('s3Uri') is not None,
+            map(
+                lambda read_key_iter_: (fastq_obj.get('readSet') or {}).get(read_key_iter_),
+                ['r1', 'r2']
+            )
+        )
+    ))
+
+
+def is_cached_gzip_file_match(
+        file_object: FileObject,
+        instrument_run_id: str,
+        gzip_compression_size_in_bytes: Optional[int]
+) -> bool:
+    # The decompressed files are written under the instrument run id of the fastq
+    if instrument_run_id not in Path(file_object['key']).parent.parts:
+        return False
+    if gzip_compression_size_in_bytes is not None:
+        return file_object.get('size') == gzip_compression_size_in_bytes
+    return (file_object.get('size') or 0) > 0
+
+
+def get_cached_decompressed_file(
+        fastq_obj: Fastq,
+        ora_file_uri_list: List[str],
+        cached_gzip_file_objects_by_name: Dict[str, List[FileObject]]
+) -> Optional[DecompressedFile]:
+    """
+    Get the decompressed file entry for a fastq, if all of its ORA files have a cached gzip output
+    :param fastq_obj:
+    :param ora_file_uri_list:
+    :param cached_gzip_file_objects_by_name:
+    :return:
+    """
+    if len(ora_file_uri_list) == 0:
+        return None
+
+    read_file_obj_by_s3_uri = get_read_file_obj_by_s3_uri(fastq_obj)
+
+    decompressed_file_uri_by_ora_file_ingest_id_list: List[DecompressedFileUriByOraFileIngestId] = []
+    for ora_file_uri in ora_file_uri_list:
+        read_file_obj = read_file_obj_by_s3_uri.get(ora_file_uri)
+        if read_file_obj is None or read_file_obj.get('ingestId') is None:
+            return None
+
+        matching_file_objects = list(filter(
+            lambda file_object_iter_: is_cached_gzip_file_match(
+                file_object_iter_,
+                fastq_obj['instrumentRunId'],
+                read_file_obj.get('gzipCompressionSizeInBytes')
+            ),
+            cached_gzip_file_objects_by_name.get(get_gzip_file_name_from_ora_file_uri(ora_file_uri), [])
+        ))
+
+        # Ambiguous matches are decompressed again
+        if not len(matching_file_objects) == 1:
+            return None
+
+        decompressed_file_uri_by_ora_file_ingest_id_list.append({
+            "ingestId": read_file_obj['ingestId'],
+            "oraFileUri": ora_file_uri,
+            "gzipFileUri": f"s3://{matching_file_objects[0]['bucket']}/{matching_file_objects[0]['key']}",
+        })
+
+    return {
+        "fastqId": fastq_obj['id'],
+        "decompressedFileUriByOraFileIngestIdList": decompressed_file_uri_by_ora_file_ingest_id_list,
+    }
+
+
+def handler(event, context):
+    """
+    Split the fastqs into those with cached gzip outputs and those that still need decompressing
+    """
+    fastq_id_list: List[str] = event.get("fastqIdList", [])
+    file_uri_by_fastq_id_map: Dict[str, List[str]] = event.get("fileUriByFastqIdMap", {})
+    cache_uri: Optional[str] = event.get("cacheUri", None)
+
+    if cache_uri is None:
+        raise ValueError("cacheUri is a required input")
+
+    # Index the gzip files under the cache prefix by their file name
+    cached_gzip_file_objects_by_name: Dict[str, List[FileObject]] = {}
+    for file_object in get_cached_gzip_file_objects(cache_uri):
+        cached_gzip_file_objects_by_name.setdefault(Path(file_object['key']).name, []).append(file_object)
+
+    # Nothing has been decompressed yet
+    if len(cached_gzip_file_objects_by_name) == 0:
+        return {
+            "decompressedFileList": [],
+            "missingFastqIdList": fastq_id_list,
+            "missingFileUriByFastqIdMap": file_uri_by_fastq_id_map,
+        }
+
+    # Get the read files (with their ingest ids and gzip sizes) of each fastq
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
+        fastq_obj_list: List[Fastq] = list(executor.map(
+            lambda fastq_id_iter_: get_fastq(fastq_id_iter_, includeS3Details=True),
+            fastq_id_list
+        ))
+
+    decompressed_file_list: List[DecompressedFile] = []
+    missing_fastq_id_list: List[str] = []
+    for fastq_id, fastq_obj in zip(fastq_id_list, fastq_obj_list):
+        decompressed_file = get_cached_decompressed_file(
+            fastq_obj,
+            file_uri_by_fastq_id_map.get(fastq_id, []),
+            cached_gzip_file_objects_by_name
+        )
+        if decompressed_file is None:
+            missing_fastq_id_list.append(fastq_id)
+        else:
+            decompressed_file_list.append(decompressed_file)
+
+    return {
+        "decompressedFileList": decompressed_file_list,
+        "missingFastqIdList": missing_fastq_id_list,
+        "missingFileUriByFastqIdMap": dict(map(
+            lambda fastq_id_iter_: (fastq_id_iter_, file_uri_by_fastq_id_map.get(fastq_id_iter_, [])),
+            missing_fastq_id_list
+        )),
+    }
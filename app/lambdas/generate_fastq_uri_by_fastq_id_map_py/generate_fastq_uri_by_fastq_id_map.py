@@ -4,6 +4,9 @@
 Generate fastq uri by fastq id map
 
 Given fastqIdList and fastqListRows, provide a dict of fastqIds to fileUris
+
+The rgids of the fastq list rows are resolved with one (paged) query per library (rglb)
+rather than one query per rgid.
 """
 
 # Standard imports
@@ -11,13 +14,13 @@ from typing import Dict, List
 import typing
 
 # Layer imports
-from orcabus_api_tools.fastq import get_fastq_by_rgid
-
+from oncoanalyser_tools.fastq import get_library_fastqs, get_fastq_id_by_rgid_map
 
 # Type hints
 if typing.TYPE_CHECKING:
     from orcabus_api_tools.fastq.models import FastqListRowDict
 
+
 def handler(event, context) -> Dict[str, Dict[str, List[str]]]:
     """
     Generate the fastq id to uri map
@@ -27,11 +30,26 @@ def handler(event, context) -> Dict[str, Dict[str, List[str]]]:
     fastq_id_list: List[str] = event["fastqIdList"]
     fastq_list_rows: List['FastqListRowDict'] = event["fastqListRows"]
 
+    # Resolve all rgids up front
+    fastq_id_by_rgid_map = get_fastq_id_by_rgid_map(
+        list(map(
+            lambda fastq_list_row_iter_: fastq_list_row_iter_['rgid'],
+            fastq_list_rows
+        )),
+        get_library_fastqs(list(filter(
+            lambda library_id_iter_: library_id_iter_ is not None,
+            map(
+                lambda fastq_list_row_iter_: fastq_list_row_iter_.get('rglb'),
+                fastq_list_rows
+            )
+        )))
+    )
+
     # Generate the map
     file_uri_by_fastq_id_map = {}
     for fastq_list_row_iter_ in fastq_list_rows:
         # Match the fastq id
-        fastq_id_iter: str = get_fastq_by_rgid(fastq_list_row_iter_['rgid'])['id']
+        fastq_id_iter: str = fastq_id_by_rgid_map[fastq_list_row_iter_['rgid']]
         if fastq_id_iter not in fastq_id_list:
             raise ValueError(f"Fastq id {fastq_id_iter} from fastq list rows is not in the provided fastq id list")
 
@@ -10,59 +10,222 @@ Under 500 million bases: SMALL
 Under 1 billion bases: MEDIUM
 
 Over 1 billion bases: LARGE
+
+Each decision is logged (and returned) with its inputs, including the input type ('BAM' or the fastq compression type,
+'ORA' or 'GZIP') and mode of the analysis, so the bins can be tuned against observed run footprints.
+
+The basecount estimates are fetched concurrently, and cached per fastq id for BASECOUNT_EST_CACHE_TTL_SECONDS
+on a warm container (the same fastqs are re-sized every time a draft is re-populated).
 """
 
 # Standard imports
+import json
+import logging
 import typing
-from typing import List
-
+from concurrent.futures import ThreadPoolExecutor
+from os import environ
+from typing import Dict, List, Literal, Optional, TypedDict
 
 # Layer imports
 from orcabus_api_tools.fastq import get_fastq
+from oncoanalyser_tools.cache import ttl_lru_cache, CACHE_STATS
 
 # Model imports
 if typing.TYPE_CHECKING:
     from orcabus_api_tools.icav2_wes.models import AnalysisStorageSize
-    from orcabus_api_tools.fastq.models import Fastq
+    from orcabus_api_tools.fastq.models import Fastq, FastqListRowDict
+
+# Globals
+MAX_CONCURRENCY_ENV_VAR = "BASECOUNT_MAX_CONCURRENCY"
+DEFAULT_MAX_CONCURRENCY = 8
+BASECOUNT_EST_CACHE_TTL_ENV_VAR = "BASECOUNT_EST_CACHE_TTL_SECONDS"
+DEFAULT_BASECOUNT_EST_CACHE_TTL_SECONDS = 900
+BASECOUNT_EST_CACHE_TTL_SECONDS = int(
+    environ.get(BASECOUNT_EST_CACHE_TTL_ENV_VAR, DEFAULT_BASECOUNT_EST_CACHE_TTL_SECONDS)
+)
+BASECOUNT_EST_CACHE_MAXSIZE = 4096
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+InputType = Literal[
+    'BAM',
+    'ORA',
+    'GZIP'
+]
+
+
+class AnalysisStorageSizeThreshold(TypedDict):
+    analysisStorageSize: 'AnalysisStorageSize'
+    # None for no upper limit
+    maxBaseCountEst: Optional[int]
+
+
+class AnalysisStorageSizeDecision(TypedDict):
+    analysisStorageSize: 'AnalysisStorageSize'
+    baseCountEst: int
+    fastqCount: int
+    fastqsWithoutBaseCountEst: int
+    inputType: Optional[InputType]
+    mode: Optional[str]
+    thresholds: List[AnalysisStorageSizeThreshold]
+
+
+# Analysis storage size bins, by total base count estimate
+ANALYSIS_STORAGE_SIZE_THRESHOLDS: List[AnalysisStorageSizeThreshold] = [
+    {"analysisStorageSize": "SMALL", "maxBaseCountEst": 500_000_000},
+    {"analysisStorageSize": "MEDIUM", "maxBaseCountEst": 1_000_000_000},
+    {"analysisStorageSize": "LARGE", "maxBaseCountEst": None},
+]
+
+
+def get_compression_type_from_fastq_list_rows(fastq_list_rows: List['FastqListRowDict']) -> InputType:
+    """
+    Same as the determine_fastq_compression_type lambda,
+    the first row's read1FileUri decides if the fastqs are ORA or GZIP compressed
+    :param fastq_list_rows:
+    :return:
+    """
+    if fastq_list_rows[0]['read1FileUri'].endswith('.ora'):
+        return "ORA"
+    return "GZIP"
 
 
-def get_analysis_storage_size_from_basecount_est(basecount_est: int) -> 'AnalysisStorageSize':
+def get_input_type_from_inputs(inputs: Dict) -> Optional[InputType]:
     """
-    Get the analysis storage size from the basecount estimate
+    Get the input type of the analysis, BAM if the inputs are bam uris, otherwise the fastq compression type
+    :param inputs:
+    :return:
+    """
+    if inputs.get('tumorDnaBamUri', None) is not None or inputs.get('normalDnaBamUri', None) is not None:
+        return "BAM"
+
+    fastq_list_rows = inputs.get('tumorFastqListRows', []) + inputs.get('normalFastqListRows', [])
+    if len(fastq_list_rows) > 0:
+        return get_compression_type_from_fastq_list_rows(fastq_list_rows)
+
+    return None
+
+
+def get_analysis_storage_size_from_basecount_est(
+        basecount_est: int,
+        thresholds: List[AnalysisStorageSizeThreshold]
+) -> 'AnalysisStorageSize':
+    """
+    Get the analysis storage size from the basecount estimate,
+    the first size whose maxBaseCountEst is not exceeded (or that has no upper limit)
     :param basecount_est:
+    :param thresholds:
     :return:
     """
-    if basecount_est < 500_000_000:
-        return "SMALL"
-    elif basecount_est < 1_000_000_000:
-        return "MEDIUM"
-    else:
-        return "LARGE"
+    for threshold_iter in thresholds:
+        if threshold_iter['maxBaseCountEst'] is None or basecount_est < threshold_iter['maxBaseCountEst']:
+            return threshold_iter['analysisStorageSize']
+
+    # Thresholds without an unbounded size, use the largest size
+    return thresholds[-1]['analysisStorageSize']
+
+
+@ttl_lru_cache(BASECOUNT_EST_CACHE_TTL_SECONDS, BASECOUNT_EST_CACHE_MAXSIZE)
+def get_set_basecount_est_from_fastq_id(fastq_id: str) -> int:
+    """
+    Get the basecount estimate of a fastq
+    :param fastq_id:
+    :return:
+    :raises ValueError: If the fastq has no estimate yet (so it is not cached, and re-fetched on the next call)
+    """
+    fastq_obj: 'Fastq' = get_fastq(fastq_id)
+    basecount_est = fastq_obj.get('baseCountEst', None)
+
+    if basecount_est is None:
+        raise ValueError(f"Fastq '{fastq_id}' has no basecount estimate yet")
+
+    return basecount_est
+
+
+def get_basecount_est_from_fastq_id(fastq_id: str) -> Optional[int]:
+    """
+    Get the basecount estimate of a fastq, None if the fastq has no estimate yet
+    :param fastq_id:
+    :return:
+    """
+    try:
+        return get_set_basecount_est_from_fastq_id(fastq_id)
+    except ValueError:
+        return None
+
+
+def get_basecount_est_by_fastq_id(fastq_id_list: List[str]) -> Dict[str, Optional[int]]:
+    """
+    Get the basecount estimate for each (unique) fastq id concurrently
+    :param fastq_id_list:
+    :return:
+    """
+    unique_fastq_id_list = sorted(set(fastq_id_list))
+
+    with ThreadPoolExecutor(
+            max_workers=int(environ.get(MAX_CONCURRENCY_ENV_VAR, DEFAULT_MAX_CONCURRENCY))
+    ) as executor:
+        return dict(zip(
+            unique_fastq_id_list,
+            executor.map(get_basecount_est_from_fastq_id, unique_fastq_id_list)
+        ))
 
 
 def handler(event, context):
     """
     Given a list of fastq ids, get the basecount estimate for each fastq and determine the analysis storage size
+
+    Input:
+    {
+        "fastqIdList": ["fqr.123", ...],
+        "inputs": {...}  (optional, the draft inputs, used for the input type and mode)
+    }
+
+    Output:
+    {
+        "analysisStorageSize": "MEDIUM",
+        "analysisStorageSizeDecision": {...}
+    }
     :param event:
     :param context:
     :return:
     """
     # Get the fastq id list from the event
     fastq_id_list = event["fastqIdList"]
+    inputs = event.get("inputs", None) or {}
 
-    # Get the fastq objects
-    fastq_objs: List['Fastq'] = list(map(
-        lambda fastq_id_iter_: get_fastq(fastq_id_iter_),
-        fastq_id_list
-    ))
+    # Get the basecount estimates
+    basecount_est_by_fastq_id = get_basecount_est_by_fastq_id(fastq_id_list)
 
     # Get the total base count estimate
     basecount_sum = sum(map(
-        lambda fastq_obj_iter_: fastq_obj_iter_.get('baseCountEst', 0),
-        fastq_objs
+        lambda basecount_est_iter_: basecount_est_iter_ or 0,
+        basecount_est_by_fastq_id.values()
     ))
 
+    logger.info(f"Basecount estimate cache stats: {CACHE_STATS}")
+
+    decision: AnalysisStorageSizeDecision = {
+        "analysisStorageSize": get_analysis_storage_size_from_basecount_est(
+            basecount_sum, ANALYSIS_STORAGE_SIZE_THRESHOLDS
+        ),
+        "baseCountEst": basecount_sum,
+        "fastqCount": len(basecount_est_by_fastq_id),
+        "fastqsWithoutBaseCountEst": len(list(filter(
+            lambda basecount_est_iter_: basecount_est_iter_ is None,
+            basecount_est_by_fastq_id.values()
+        ))),
+        "inputType": get_input_type_from_inputs(inputs),
+        "mode": inputs.get('mode', None),
+        "thresholds": ANALYSIS_STORAGE_SIZE_THRESHOLDS,
+    }
+
+    # Record the decision, one json line per decision so it can be queried in the logs
+    logger.info(json.dumps({"analysisStorageSizeDecision": decision}))
+
     # Return the storage size
     return {
-        "analysisStorageSize": get_analysis_storage_size_from_basecount_est(basecount_sum)
+        "analysisStorageSize": decision['analysisStorageSize'],
+        "analysisStorageSizeDecision": decision,
     }
@@ -3,20 +3,82 @@
 """
 1 Get the latest succeeded workflow for a given library id
 2 Get the BAM file from that workflow
+
+The dragen runs shared by the tumor and normal libraries are sorted newest first by orcabus id (ULID order)
+before any run detail is fetched, only the newest run's detail is requested to check it has succeeded.
+
+The filemanager listing of a dragen portal run id holds thousands of files,
+only the bam and bam index files are requested (key=*.bam*), once per invocation,
+and cached for the life of a warm container (PORTAL_RUN_ID_LISTING_CACHE_TTL_SECONDS).
+The tumor and normal bams and their bam indexes are then picked out of the listing in a single pass.
 """
 
 # Standard imports
-from typing import Optional, Literal, List
+import logging
+from os import environ
+from typing import Optional, Literal, List, Dict, TypedDict, Iterator
+
+from requests import HTTPError
 
 # Layer imports
 from orcabus_api_tools.workflow import get_workflows_from_library_id, get_workflow_run
 from orcabus_api_tools.filemanager import get_file_manager_request_response_results
 from orcabus_api_tools.filemanager.models import FileObject
+from oncoanalyser_tools.cache import ttl_lru_cache, CACHE_STATS
 
 # Globals
 DRAGEN_WGTS_DNA_WORKFLOW_RUN_NAME = "dragen-wgts-dna"
 Phenotype = Literal["TUMOR", "NORMAL"]
 
+PORTAL_RUN_ID_LISTING_CACHE_TTL_ENV_VAR = "PORTAL_RUN_ID_LISTING_CACHE_TTL_SECONDS"
+# How long the listing of a portal run id is reused for on a warm container
+DEFAULT_PORTAL_RUN_ID_LISTING_CACHE_TTL_SECONDS = 300
+PORTAL_RUN_ID_LISTING_CACHE_TTL_SECONDS = int(
+    environ.get(PORTAL_RUN_ID_LISTING_CACHE_TTL_ENV_VAR, DEFAULT_PORTAL_RUN_ID_LISTING_CACHE_TTL_SECONDS)
+)
+PORTAL_RUN_ID_LISTING_CACHE_MAXSIZE = 16
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+class DragenBamFiles(TypedDict):
+    tumorBam: Optional[FileObject]
+    tumorBamIndex: Optional[FileObject]
+    normalBam: Optional[FileObject]
+    normalBamIndex: Optional[FileObject]
+
+
+# Key suffix of each dragen bam file
+DRAGEN_BAM_FILE_SUFFIXES: Dict[str, str] = {
+    "tumorBam": "_tumor.bam",
+    "tumorBamIndex": "_tumor.bam.bai",
+    "normalBam": "_normal.bam",
+    "normalBamIndex": "_normal.bam.bai",
+}
+# Common to every key in DRAGEN_BAM_FILE_SUFFIXES
+DRAGEN_BAM_KEY_FILTER = ".bam"
+
+
+def iter_intersecting_workflow_ids_newest_first(
+        tumor_workflows: List[Dict],
+        normal_workflows: List[Dict]
+) -> Iterator[str]:
+    """
+    Lazily yield the orcabus ids of the workflow runs shared by the tumor and normal workflows, newest first
+    :param tumor_workflows:
+    :param normal_workflows:
+    :return:
+    """
+    normal_workflow_ids = set(map(lambda workflow_iter_: workflow_iter_['orcabusId'], normal_workflows))
+    yield from sorted(
+        set(filter(
+            lambda workflow_id_iter_: workflow_id_iter_ in normal_workflow_ids,
+            map(lambda workflow_iter_: workflow_iter_['orcabusId'], tumor_workflows)
+        )),
+        reverse=True
+    )
+
 
 def get_latest_dragen_workflow(
         tumor_library_id: str,
@@ -38,6 +100,11 @@ def get_latest_dragen_workflow(
         ),
         get_workflows_from_library_id(tumor_library_id)
     ))
+
+    # No need to list the normal workflows if the tumor library has none
+    if len(tumor_workflows) == 0:
+        return None
+
     normal_workflows = list(filter(
         lambda workflow_iter_: (
             workflow_iter_['workflow'].get('name', "") == DRAGEN_WGTS_DNA_WORKFLOW_RUN_NAME or
@@ -47,39 +114,18 @@ def get_latest_dragen_workflow(
         get_workflows_from_library_id(normal_library_id)
     ))
 
-    if len(tumor_workflows) == 0 or len(normal_workflows) == 0:
-        return None
-
-    # Get intersection of workflow IDs
-    intersecting_workflow_ids = list(
-        set(
-            list(map(lambda workflow_iter_: workflow_iter_['orcabusId'], tumor_workflows))
-        ).intersection(
-            set(
-                list(map(lambda workflow_iter_: workflow_iter_['orcabusId'], normal_workflows))
-            )
-        )
+    # Workflow run orcabus ids are ULIDs, so they sort in creation order
+    # Only the newest run shared by both libraries is considered, its detail is the only one fetched
+    latest_workflow_id = next(
+        iter_intersecting_workflow_ids_newest_first(tumor_workflows, normal_workflows),
+        None
     )
 
     # If no intersecting workflows, return None
-    if len(intersecting_workflow_ids) == 0:
+    if latest_workflow_id is None:
         return None
 
-    # Get the intersection of workflow objects
-    intersecting_workflows = list(map(
-        lambda workflow_iter_: get_workflow_run(workflow_iter_['orcabusId']),
-        list(filter(
-            lambda workflow_iter_: workflow_iter_['orcabusId'] in intersecting_workflow_ids,
-            tumor_workflows
-        ))
-    ))
-
-    # Get the latest workflow by orcabusId
-    latest_workflow = sorted(
-        intersecting_workflows,
-        key=lambda workflow_iter_: workflow_iter_['orcabusId'],
-        reverse=True
-    )[0]
+    latest_workflow = get_workflow_run(latest_workflow_id)
 
     # Check the state of the latest workflow, if it is not succeeded we should not use it
     if not latest_workflow['currentState']['status'] == 'SUCCEEDED':
@@ -88,31 +134,75 @@ def get_latest_dragen_workflow(
     return latest_workflow['portalRunId']
 
 
+@ttl_lru_cache(PORTAL_RUN_ID_LISTING_CACHE_TTL_SECONDS, PORTAL_RUN_ID_LISTING_CACHE_MAXSIZE)
+def get_file_objects_from_portal_run_id(portal_run_id: str) -> List[FileObject]:
+    """
+    List the bam and bam index files of a portal run id,
+    the returned list is shared between callers and must not be modified.
+
+    The key filter is sent to the filemanager (key=*<DRAGEN_BAM_KEY_FILTER>*), so the thousands of other files
+    of a dragen output folder are not transferred.
+    The full listing is only paged through if the filtered query is rejected (an error response).
+    :param portal_run_id:
+    :return:
+    """
+    try:
+        return get_file_manager_request_response_results(
+            endpoint="api/v1/s3/attributes",
+            params={
+                "portalRunId": portal_run_id,
+                "key": f"*{DRAGEN_BAM_KEY_FILTER}*",
+            }
+        )
+    except HTTPError as e:
+        logger.warning(
+            f"Filtered query for *{DRAGEN_BAM_KEY_FILTER}* failed for {portal_run_id} ({e}), listing all files"
+        )
+        return get_file_manager_request_response_results(
+            endpoint="api/v1/s3/attributes",
+            params={
+                "portalRunId": portal_run_id,
+            }
+        )
+
+
+def get_dragen_bam_files(file_objects: List[FileObject]) -> DragenBamFiles:
+    """
+    Pick the tumor and normal bams and their bam indexes out of a portal run listing in a single pass.
+    The first file matching each suffix is used.
+    :param file_objects:
+    :return:
+    """
+    dragen_bam_files: DragenBamFiles = {
+        "tumorBam": None,
+        "tumorBamIndex": None,
+        "normalBam": None,
+        "normalBamIndex": None,
+    }
+
+    for file_object in file_objects:
+        for bam_file_key, key_suffix in DRAGEN_BAM_FILE_SUFFIXES.items():
+            if dragen_bam_files[bam_file_key] is None and file_object['key'].endswith(key_suffix):
+                dragen_bam_files[bam_file_key] = file_object
+
+        # Stop once everything has been found
+        if all(map(lambda file_obj_iter_: file_obj_iter_ is not None, dragen_bam_files.values())):
+            break
+
+    return dragen_bam_files
+
+
 def get_bam_from_dragen_workflow(portal_run_id: str, phenotype: Phenotype) -> Optional[FileObject]:
-    bam_file: FileObject
-    if phenotype == 'TUMOR':
-        bam_file = next(filter(
-            lambda file_iter: file_iter['key'].endswith("_tumor.bam"),
-            get_file_manager_request_response_results(
-                endpoint="api/v1/s3/attributes",
-                params={
-                    "portalRunId": portal_run_id,
-                }
-            )
-        ))
-        return bam_file
-    elif phenotype == 'NORMAL':
-        bam_file = next(filter(
-            lambda file_iter: file_iter['key'].endswith("_normal.bam"),
-            get_file_manager_request_response_results(
-                endpoint="api/v1/s3/attributes",
-                params={
-                    "portalRunId": portal_run_id,
-                }
-            )
-        ))
-        return bam_file
-    raise ValueError("Phenotype must be either 'TUMOR' or 'NORMAL'")
+    if phenotype not in ['TUMOR', 'NORMAL']:
+        raise ValueError("Phenotype must be either 'TUMOR' or 'NORMAL'")
+
+    bam_file_key = 'tumorBam' if phenotype == 'TUMOR' else 'normalBam'
+    bam_file = get_dragen_bam_files(get_file_objects_from_portal_run_id(portal_run_id))[bam_file_key]
+
+    if bam_file is None:
+        raise ValueError(f"Could not find a {phenotype.lower()} bam file for portal run id {portal_run_id}")
+
+    return bam_file
 
 
 def handler(event, context):
@@ -149,8 +239,13 @@ def handler(event, context):
         if portal_run_id is None:
             return {}
 
-        tumor_bam_file_obj = get_bam_from_dragen_workflow(portal_run_id, phenotype='TUMOR')
-        normal_bam_file_obj = get_bam_from_dragen_workflow(portal_run_id, phenotype='NORMAL')
+        # Both bams come from the same listing
+        dragen_bam_files = get_dragen_bam_files(get_file_objects_from_portal_run_id(portal_run_id))
+        logger.info(f"Portal run id listing cache stats: {CACHE_STATS}")
+        if dragen_bam_files['tumorBam'] is None or dragen_bam_files['normalBam'] is None:
+            raise ValueError(f"Could not find both the tumor and normal bam files for portal run id {portal_run_id}")
+        tumor_bam_file_obj = dragen_bam_files['tumorBam']
+        normal_bam_file_obj = dragen_bam_files['normalBam']
 
         # Return the bam file URIs
         # If weve set a phenotype, return only that bam, useful in the populate draft data step
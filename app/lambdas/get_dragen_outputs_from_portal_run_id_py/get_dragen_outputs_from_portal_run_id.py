@@ -3,12 +3,17 @@
 """
 1 Get the latest succeeded workflow for a given library id
 2 Get the BAM file from that workflow
+
+The bam key suffix is pushed down to the filemanager query, so only the bam (and bam index) objects are transferred.
 """
 
 # Standard imports
-from typing import Optional, Literal, List
+import logging
+from typing import Optional, Literal, List, Dict
 from pathlib import Path
 
+from requests import HTTPError
+
 # Layer imports
 from orcabus_api_tools.filemanager import get_file_manager_request_response_results
 from orcabus_api_tools.filemanager.models import FileObject
@@ -17,35 +22,64 @@ from orcabus_api_tools.filemanager.models import FileObject
 DRAGEN_WGTS_DNA_WORKFLOW_RUN_NAME = "dragen-wgts-dna"
 Phenotype = Literal["TUMOR", "NORMAL"]
 PHENOTYPE_LIST: List[Phenotype] = ["TUMOR", "NORMAL"]
+DRAGEN_BAM_KEY_SUFFIXES: Dict[Phenotype, str] = {
+    "TUMOR": "_tumor.bam",
+    "NORMAL": "_normal.bam",
+}
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+def get_file_objects_from_portal_run_id(portal_run_id: str, key_suffix: str) -> List[FileObject]:
+    """
+    Get the files of a portal run id whose key ends with key_suffix.
+
+    The key filter is sent to the filemanager (key=*<key_suffix>*), so only the bam and bam index objects are returned
+    rather than the thousands of files of a dragen output folder.
+    The full listing of the portal run id is only paged through if the filtered query is rejected
+    (an error response), an empty result is trusted.
+    :param portal_run_id:
+    :param key_suffix:
+    :return:
+    """
+    try:
+        file_objects = get_file_manager_request_response_results(
+            endpoint="api/v1/s3/attributes",
+            params={
+                "portalRunId": portal_run_id,
+                "key": f"*{key_suffix}*",
+            }
+        )
+    except HTTPError as e:
+        # Fall back to filtering the full listing on the client
+        logger.warning(f"Filtered query for *{key_suffix}* failed for {portal_run_id} ({e}), listing all files")
+        file_objects = get_file_manager_request_response_results(
+            endpoint="api/v1/s3/attributes",
+            params={
+                "portalRunId": portal_run_id,
+            }
+        )
+
+    return list(filter(
+        lambda file_iter_: file_iter_['key'].endswith(key_suffix),
+        file_objects
+    ))
 
 
 def get_bam_from_dragen_workflow(portal_run_id: str, phenotype: Phenotype) -> Optional[FileObject]:
-    bam_file: FileObject
-    if phenotype == 'TUMOR':
-        bam_file = next(filter(
-            lambda file_iter: file_iter['key'].endswith("_tumor.bam"),
-            get_file_manager_request_response_results(
-                endpoint="api/v1/s3/attributes",
-                params={
-                    "portalRunId": portal_run_id,
-                }
-            )
-        ))
-        return bam_file
-    elif phenotype == 'NORMAL':
-        bam_file = next(filter(
-            lambda file_iter: (
-                file_iter['key'].endswith("_normal.bam")
-            ),
-            get_file_manager_request_response_results(
-                endpoint="api/v1/s3/attributes",
-                params={
-                    "portalRunId": portal_run_id,
-                }
-            )
-        ))
-        return bam_file
-    raise ValueError("Phenotype must be either 'TUMOR' or 'NORMAL'")
+    if phenotype not in PHENOTYPE_LIST:
+        raise ValueError("Phenotype must be either 'TUMOR' or 'NORMAL'")
+
+    # Use the first match
+    bam_file: Optional[FileObject] = next(
+        iter(get_file_objects_from_portal_run_id(portal_run_id, key_suffix=DRAGEN_BAM_KEY_SUFFIXES[phenotype])),
+        None
+    )
+    if bam_file is None:
+        raise ValueError(f"Could not find a {phenotype.lower()} bam file for portal run id {portal_run_id}")
+
+    return bam_file
 
 
 def handler(event, context):
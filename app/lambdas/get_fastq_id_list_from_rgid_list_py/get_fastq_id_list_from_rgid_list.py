@@ -4,25 +4,80 @@
 Get the fastq ids from the rgid list
 
 Given the rgid list, return the fastq ids that are associated with these rgids.
+
+If the library ids of the rgids are provided, all fastqs of each library are collected
+in one (paged) query per library and indexed by rgid.
+Any rgid not found in the library fastqs is resolved with its own get_fastq_by_rgid lookup.
+
+If the executionArn of the calling state machine is provided, the fastqs of each library are read through
+the execution cache (keyed by execution arn and request hash),
+so the populate draft data state machine only queries each library once per execution,
+however many times (and with whichever rgid lists) it calls this lambda.
 """
 
-from orcabus_api_tools.fastq import get_fastq_by_rgid
+# Standard imports
+from typing import List
+
+# Layer imports
+from orcabus_api_tools.fastq import get_fastqs_in_library
+from orcabus_api_tools.fastq.models import Fastq
+from oncoanalyser_tools.execution_cache import execution_memo
+from oncoanalyser_tools.fastq import get_library_fastqs, get_fastq_id_by_rgid_map
+
+# Globals
+# The fastq fields needed to resolve an rgid, only these are kept in the execution cache
+FASTQ_RGID_FIELDS = ['id', 'index', 'lane', 'instrumentRunId']
+
+
+def get_library_fastq_rgid_fields(library_id: str) -> List[Fastq]:
+    """
+    Get the fastqs of a library, with only the fields needed to resolve their rgids
+    :param library_id:
+    :return:
+    """
+    return list(map(
+        lambda fastq_obj_iter_: dict(map(
+            lambda field_iter_: (field_iter_, fastq_obj_iter_.get(field_iter_, None)),
+            FASTQ_RGID_FIELDS
+        )),
+        get_fastqs_in_library(library_id)
+    ))
 
 
 def handler(event, context):
     """
     Given a list of fastq RGIDs, return the corresponding fastq IDs.
-    :param event: A dictionary containing the key "fastqRgidList", which is a list of fastq RGIDs.
+    :param event: A dictionary containing the key "fastqRgidList", which is a list of fastq RGIDs,
+        and optionally "libraryIdList", the libraries these RGIDs belong to,
+        and "executionArn", the calling state machine execution (to share the library fastqs across calls).
     :param context: AWS Lambda context object (not used in this function).
-    :return: A dictionary with the key "fastqIdList", which is a list of fastq IDs corresponding to the input RGIDs.
+    :return: A dictionary with the key "fastqIdList", which is a list of fastq IDs corresponding to the input RGIDs,
+        and "fastqIdByRgidMap", the fastq ID for each RGID.
     """
     fastq_rgid_list = event.get("fastqRgidList", [])
+    library_id_list = event.get("libraryIdList", None)
+    execution_arn = event.get("executionArn", None)
+
+    # Collect the library fastqs, each library at most once per execution
+    fastq_id_by_rgid_map = get_fastq_id_by_rgid_map(
+        fastq_rgid_list,
+        get_library_fastqs(
+            library_id_list or [],
+            fetch_library_fastqs=lambda library_id_iter_: execution_memo(
+                execution_arn,
+                "get_library_fastq_rgid_fields",
+                {"libraryId": library_id_iter_},
+                lambda: get_library_fastq_rgid_fields(library_id_iter_)
+            )
+        )
+    )
 
     all_fastq_ids = sorted(list(map(
-        lambda fastq_rgid_iter_: get_fastq_by_rgid(fastq_rgid_iter_)['id'],
+        lambda fastq_rgid_iter_: fastq_id_by_rgid_map[fastq_rgid_iter_],
         fastq_rgid_list
     )))
 
     return {
-        "fastqIdList": all_fastq_ids
+        "fastqIdList": all_fastq_ids,
+        "fastqIdByRgidMap": fastq_id_by_rgid_map
     }
@@ -1,17 +1,87 @@
 #!/usr/bin/env python3
 
+"""
+Convert a list of fastq rgids into fastq list rows
+
+If the library ids of the rgids are provided, the rgids are resolved with one (paged) query per library
+rather than one query per rgid.
+
+Fastq list rows are requested from the test data bucket for fastqs whose files are in the test data bucket,
+and under the s3 uri prefix (if provided) otherwise.
+The fastqs are classified from their file locations (queried once with includeS3Details),
+only the ambiguous fastqs (no read set, or files in both the test data bucket and elsewhere)
+are first tried against the test data bucket and then requested again under the s3 uri prefix.
+The requests are run concurrently, capped at MAX_CONCURRENCY requests in flight.
+"""
+
 # Standard imports
+from concurrent.futures import ThreadPoolExecutor
 from os import environ
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
 from requests import HTTPError
 
 # Layer imports
-from orcabus_api_tools.fastq import to_fastq_list_row, get_fastq_by_rgid
+from orcabus_api_tools.fastq import to_fastq_list_row, get_fastq, get_fastqs_in_library
+from orcabus_api_tools.fastq.models import Fastq, FastqListRowDict
+from oncoanalyser_tools.fastq import get_library_fastqs, get_fastq_id_by_rgid_map
+from oncoanalyser_tools.filemanager import get_file_objects_by_ingest_id
 
 # Globals
 TEST_DATA_BUCKET_NAME_ENV_VAR = "TEST_DATA_BUCKET_NAME"
+MAX_CONCURRENCY = 8
+
+# Fastq classifications
+TEST_DATA = "TEST_DATA"
+NON_TEST_DATA = "NON_TEST_DATA"
+AMBIGUOUS = "AMBIGUOUS"
+
+
+def get_read_file_list(fastq_obj: Fastq) -> List[Dict]:
+    """
+    Get the read files (with their s3 uri and ingest id) of a fastq object queried with includeS3Details
+    """
+    read_set = fastq_obj.get('readSet') or {}
+    return list(filter(
+        lambda read_iter_: read_iter_ is not None and read_iter_.get('s3Uri') is not None,
+        [read_set.get('r1'), read_set.get('r2')]
+    ))
+
+
+def classify_fastq(fastq_obj: Fastq, test_data_ingest_id_set: set) -> str:
+    """
+    Classify a fastq as test data (all files in the test data bucket), non test data (no files in the test data bucket)
+    or ambiguous (no read set, or files with copies in the test data bucket)
+    """
+    read_file_list = get_read_file_list(fastq_obj)
+    if len(read_file_list) == 0:
+        return AMBIGUOUS
+
+    if all(map(
+        lambda read_iter_: urlparse(read_iter_['s3Uri']).netloc == environ[TEST_DATA_BUCKET_NAME_ENV_VAR],
+        read_file_list
+    )):
+        return TEST_DATA
+
+    if any(map(
+        lambda read_iter_: read_iter_.get('ingestId') in test_data_ingest_id_set,
+        read_file_list
+    )):
+        return AMBIGUOUS
+
+    return NON_TEST_DATA
+
+
+def get_test_data_fastq_list_row(fastq_id: str) -> Optional[FastqListRowDict]:
+    """
+    Get the fastq list row from the test data bucket, None if the fastq is not in the test data bucket
+    """
+    try:
+        return to_fastq_list_row(fastq_id, bucket=environ[TEST_DATA_BUCKET_NAME_ENV_VAR])
+    except HTTPError:
+        return None
 
 
 def handler(event, context):
@@ -25,6 +95,7 @@ def handler(event, context):
     # Get the fastqList from the event
     fastq_rgid_list = event.get("fastqRgidList", [])
     s3_uri_prefix = event.get("s3UriPrefix", None)
+    library_id_list = event.get("libraryIdList", None)
 
     # Convert the uri prefix to a parsed object
     s3_uri_obj = (
@@ -33,29 +104,69 @@ def handler(event, context):
         else None
     )
 
+    # Collect the library fastqs with their file locations
+    library_fastqs = get_library_fastqs(
+        library_id_list or [],
+        fetch_library_fastqs=lambda library_id_iter_: get_fastqs_in_library(library_id_iter_, includeS3Details=True)
+    )
+
     # Collect all fastq ids from the rgid list
+    fastq_id_by_rgid_map = get_fastq_id_by_rgid_map(fastq_rgid_list, library_fastqs)
     all_fastq_ids = sorted(list(map(
-        lambda fastq_rgid_iter_: get_fastq_by_rgid(fastq_rgid_iter_)['id'],
+        lambda fastq_rgid_iter_: fastq_id_by_rgid_map[fastq_rgid_iter_],
         fastq_rgid_list
     )))
 
-    # Keep the test-data fastq list rows
-    # (which are exempt from the requirement of being in a particular project prefix)
-    non_test_data_fastq_list_ids = []
-    test_data_fastq_list_rows = []
-
-    # Try collect each fastq list row in the test-data section first
-    for fastq_id_iter in all_fastq_ids:
-        try:
-            test_data_fqlr_iter = to_fastq_list_row(fastq_id_iter, bucket=environ[TEST_DATA_BUCKET_NAME_ENV_VAR])
-            test_data_fastq_list_rows.append(test_data_fqlr_iter)
-        except HTTPError:
-            non_test_data_fastq_list_ids.append(fastq_id_iter)
-
-    # Re-collect the test-data fastq list rows with the s3 uri prefix if provided
-    non_test_data_fastq_list_rows = list(map(
-        lambda fastq_id_iter_: to_fastq_list_row(
+    # Get the fastq objects with their file locations, fetching any not returned by the library queries
+    fastq_obj_by_id = dict(map(
+        lambda fastq_obj_iter_: (fastq_obj_iter_['id'], fastq_obj_iter_),
+        library_fastqs
+    ))
+    missing_fastq_ids = sorted(set(filter(
+        lambda fastq_id_iter_: fastq_id_iter_ not in fastq_obj_by_id,
+        all_fastq_ids
+    )))
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
+        fastq_obj_by_id.update(dict(zip(
+            missing_fastq_ids,
+            executor.map(
+                lambda fastq_id_iter_: get_fastq(fastq_id_iter_, includeS3Details=True),
+                missing_fastq_ids
+            )
+        )))
+
+    # Find the files outside the test data bucket that also have a copy in the test data bucket (one bulk query)
+    test_data_ingest_id_set = set(get_file_objects_by_ingest_id(
+        list(filter(
+            lambda ingest_id_iter_: ingest_id_iter_ is not None,
+            map(
+                lambda read_iter_: read_iter_.get('ingestId'),
+                filter(
+                    lambda read_iter_: urlparse(read_iter_['s3Uri']).netloc != environ[TEST_DATA_BUCKET_NAME_ENV_VAR],
+                    [
+                        read_file
+                        for fastq_id in all_fastq_ids
+                        for read_file in get_read_file_list(fastq_obj_by_id[fastq_id])
+                    ]
+                )
+            )
+        )),
+        bucket=environ[TEST_DATA_BUCKET_NAME_ENV_VAR],
+        max_concurrency=MAX_CONCURRENCY
+    ).keys())
+
+    classification_by_fastq_id = dict(map(
+        lambda fastq_id_iter_: (
             fastq_id_iter_,
+            classify_fastq(fastq_obj_by_id[fastq_id_iter_], test_data_ingest_id_set)
+        ),
+        all_fastq_ids
+    ))
+
+    def get_non_test_data_fastq_list_row(fastq_id: str) -> FastqListRowDict:
+        # Collect the non test-data fastq list row with the s3 uri prefix if provided
+        return to_fastq_list_row(
+            fastq_id,
             **(
                 {
                     "bucket": s3_uri_obj.netloc,
@@ -64,11 +175,28 @@ def handler(event, context):
                 if s3_uri_obj is not None
                 else {}
             )
-        ),
-        non_test_data_fastq_list_ids
-    ))
+        )
+
+    def get_fastq_list_row(fastq_id: str) -> Tuple[bool, FastqListRowDict]:
+        # Returns whether the fastq list row is from the test data bucket, and the fastq list row
+        classification = classification_by_fastq_id[fastq_id]
+        if classification == TEST_DATA:
+            return True, to_fastq_list_row(fastq_id, bucket=environ[TEST_DATA_BUCKET_NAME_ENV_VAR])
+        if classification == AMBIGUOUS:
+            # Try collect the fastq list row in the test-data section first
+            # (test-data fastqs are exempt from the requirement of being in a particular project prefix)
+            test_data_fqlr = get_test_data_fastq_list_row(fastq_id)
+            if test_data_fqlr is not None:
+                return True, test_data_fqlr
+        return False, get_non_test_data_fastq_list_row(fastq_id)
+
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
+        fqlr_list = list(executor.map(get_fastq_list_row, all_fastq_ids))
 
-    # Return the list of fastq list row dicts
+    # Return the list of fastq list row dicts, test-data fastq list rows first
     return {
-        "fastqListRows": test_data_fastq_list_rows + non_test_data_fastq_list_rows
+        "fastqListRows": (
+            list(map(lambda fqlr_iter_: fqlr_iter_[1], filter(lambda fqlr_iter_: fqlr_iter_[0], fqlr_list))) +
+            list(map(lambda fqlr_iter_: fqlr_iter_[1], filter(lambda fqlr_iter_: not fqlr_iter_[0], fqlr_list)))
+        )
     }
@@ -2,8 +2,13 @@
 
 """
 Given an ICAv2 project id, get the base uri for that project
+
+The project prefix and the ICAv2 env vars are cached for the life of a warm container
+(ICAV2_METADATA_CACHE_TTL_SECONDS), in the same way as the post schema validation lambda.
 """
 # Standard imports
+import logging
+from os import environ
 from typing import Dict, cast
 
 # Wrapica imports
@@ -11,6 +16,28 @@ from wrapica.storage_configuration import get_s3_key_prefix_by_project_id
 
 # Layer imports
 from icav2_tools import set_icav2_env_vars
+from oncoanalyser_tools.cache import ttl_lru_cache, CACHE_STATS
+
+# Globals
+ICAV2_METADATA_CACHE_TTL_ENV_VAR = "ICAV2_METADATA_CACHE_TTL_SECONDS"
+# How long project storage configuration lookups are trusted for on a warm container
+DEFAULT_ICAV2_METADATA_CACHE_TTL_SECONDS = 600
+ICAV2_METADATA_CACHE_TTL_SECONDS = int(
+    environ.get(ICAV2_METADATA_CACHE_TTL_ENV_VAR, DEFAULT_ICAV2_METADATA_CACHE_TTL_SECONDS)
+)
+ICAV2_METADATA_CACHE_MAXSIZE = 128
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+# ICAv2 metadata lookups, these rarely change between invocations
+set_icav2_env_vars_cached = ttl_lru_cache(
+    ICAV2_METADATA_CACHE_TTL_SECONDS, ICAV2_METADATA_CACHE_MAXSIZE
+)(set_icav2_env_vars)
+get_s3_key_prefix_by_project_id_cached = ttl_lru_cache(
+    ICAV2_METADATA_CACHE_TTL_SECONDS, ICAV2_METADATA_CACHE_MAXSIZE
+)(get_s3_key_prefix_by_project_id)
 
 
 def handler(event, context) -> Dict[str, str]:
@@ -18,7 +45,7 @@ def handler(event, context) -> Dict[str, str]:
     Given an ICAv2 project id, get the base uri for that project
     """
     # Set env vars
-    set_icav2_env_vars()
+    set_icav2_env_vars_cached()
 
     # Inputs
     project_id = event.get("projectId", None)
@@ -27,6 +54,10 @@ def handler(event, context) -> Dict[str, str]:
     if project_id is None:
         raise ValueError("projectId is a required input")
 
+    s3_uri = cast(str, get_s3_key_prefix_by_project_id_cached(project_id))
+
+    logger.info(f"ICAv2 lookup cache stats: {CACHE_STATS}")
+
     return {
-        "s3Uri": cast(str, get_s3_key_prefix_by_project_id(project_id))
+        "s3Uri": s3_uri
     }
@@ -19,11 +19,12 @@ Performs the following steps:
 * On success: return {"isValid": true}
 """
 # Imports
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Tuple, cast, List
+from typing import Dict, Tuple, cast, List, Optional
 import logging
 from os import environ
-from time import sleep
 from urllib.parse import urlparse
 
 # Wrapica imports
@@ -35,14 +36,22 @@ from wrapica.project import get_project_obj_from_project_id
 
 # Layer imports
 from orcabus_api_tools.workflow import add_comment_to_workflow_run, get_workflow_run
-from orcabus_api_tools.filemanager import get_s3_object_id_from_s3_uri, list_files_recursively
+from orcabus_api_tools.filemanager import (
+    get_s3_object_id_from_s3_uri,
+    list_files_recursively
+)
 from orcabus_api_tools.filemanager.errors import S3FileNotFoundError
 from icav2_tools import set_icav2_env_vars
+from oncoanalyser_tools.cache import ttl_lru_cache, CACHE_STATS
+from oncoanalyser_tools.filemanager import get_file_objects_by_s3_uri
 
 # Globals
 WORKFLOW_NAME_ENV_VAR = "WORKFLOW_NAME"
 TEST_BUCKET_ENV_VAR = "TEST_DATA_BUCKET_NAME"
 REF_DATA_BUCKET_ENV_VAR = "REF_DATA_BUCKET_NAME"
+MAX_CONCURRENCY_ENV_VAR = "VALIDATION_MAX_CONCURRENCY"
+PROJECT_DATA_CACHE_TTL_ENV_VAR = "PROJECT_DATA_CACHE_TTL_SECONDS"
+ICAV2_METADATA_CACHE_TTL_ENV_VAR = "ICAV2_METADATA_CACHE_TTL_SECONDS"
 # Get test / ref env var values
 TEST_BUCKET = environ[TEST_BUCKET_ENV_VAR]
 REF_DATA_BUCKET = environ[REF_DATA_BUCKET_ENV_VAR]
@@ -52,13 +61,45 @@ COMMENT_AUTHOR = f"{WORKFLOW_NAME}-workflow-validation-service"
 # Midfixes
 ANALYSIS_MIDFIXES = ["analysis", "output", "outputs"]
 LOGS_MIDFIX = "logs"
+# Upper bound on the number of in-flight Filemanager / ICA requests during input validation
+DEFAULT_MAX_CONCURRENCY = 8
+MAX_CONCURRENCY = int(environ.get(MAX_CONCURRENCY_ENV_VAR, DEFAULT_MAX_CONCURRENCY))
+# How long a confirmed project data lookup is trusted for on a warm container
+DEFAULT_PROJECT_DATA_CACHE_TTL_SECONDS = 900
+PROJECT_DATA_CACHE_TTL_SECONDS = int(
+    environ.get(PROJECT_DATA_CACHE_TTL_ENV_VAR, DEFAULT_PROJECT_DATA_CACHE_TTL_SECONDS)
+)
+PROJECT_DATA_CACHE_MAXSIZE = 4096
+# How long project, pipeline and storage configuration lookups are trusted for on a warm container
+DEFAULT_ICAV2_METADATA_CACHE_TTL_SECONDS = 600
+ICAV2_METADATA_CACHE_TTL_SECONDS = int(
+    environ.get(ICAV2_METADATA_CACHE_TTL_ENV_VAR, DEFAULT_ICAV2_METADATA_CACHE_TTL_SECONDS)
+)
+ICAV2_METADATA_CACHE_MAXSIZE = 128
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+
+# ICAv2 metadata lookups, these rarely change between invocations
+set_icav2_env_vars_cached = ttl_lru_cache(
+    ICAV2_METADATA_CACHE_TTL_SECONDS, ICAV2_METADATA_CACHE_MAXSIZE
+)(set_icav2_env_vars)
+get_s3_key_prefix_by_project_id_cached = ttl_lru_cache(
+    ICAV2_METADATA_CACHE_TTL_SECONDS, ICAV2_METADATA_CACHE_MAXSIZE
+)(get_s3_key_prefix_by_project_id)
+get_project_obj_from_project_id_cached = ttl_lru_cache(
+    ICAV2_METADATA_CACHE_TTL_SECONDS, ICAV2_METADATA_CACHE_MAXSIZE
+)(get_project_obj_from_project_id)
+get_project_pipeline_obj_cached = ttl_lru_cache(
+    ICAV2_METADATA_CACHE_TTL_SECONDS, ICAV2_METADATA_CACHE_MAXSIZE
+)(get_project_pipeline_obj)
+
 # Comment formatting constants
 MAX_COMMENT_LENGTH = 1024
 TRUNCATION_SUFFIX = "\n... [truncated, see execution ARN for full detail]"
+# Minimum gap between consecutive comment writes, keeps the comments ordered on the timeline
+COMMENT_MIN_INTERVAL_SECONDS = 1.0
 
 
 def _format_comment_with_arn(body: str, execution_arn: str) -> str:
@@ -75,6 +116,82 @@ def _format_comment_with_arn(body: str, execution_arn: str) -> str:
     return full_comment
 
 
+def pack_failure_comments(failures: List[str], execution_arn: str) -> List[str]:
+    """
+    Pack the failures into as few comments as possible, each within MAX_COMMENT_LENGTH.
+
+    Failures are numbered and kept in order, each comment gets a page header and the execution ARN footer.
+    A single failure that cannot fit on a page by itself is truncated.
+
+    :param failures: The list of failure messages
+    :param execution_arn: The step functions execution ARN
+    :return: The list of comments to write
+    """
+    if len(failures) == 1:
+        return [_format_comment_with_arn(f"Post schema validation failed: {failures[0]}", execution_arn)]
+
+    footer = f"---\nStep Functions Execution: {execution_arn}"
+    header_template = "Post schema validation failed for {num_failures} reasons (page {page} of {num_pages})"
+
+    # Reserve room for the widest possible header, we cannot have more pages than failures
+    header_length = len(header_template.format(
+        num_failures=len(failures), page=len(failures), num_pages=len(failures)
+    ))
+    # Header and footer are each separated from the lines by a newline
+    available = MAX_COMMENT_LENGTH - header_length - len(footer) - 2
+
+    # Fill each page greedily
+    pages: List[List[str]] = [[]]
+    page_length = 0
+    for idx, failure in enumerate(failures, start=1):
+        line = f"{idx}. {failure}"
+        if len(line) > available:
+            line = f"{line[:available - len(TRUNCATION_SUFFIX)]}{TRUNCATION_SUFFIX}"
+        # +1 for the newline separating this line from the one before
+        if pages[-1] and page_length + len(line) + 1 > available:
+            pages.append([])
+            page_length = 0
+        page_length += len(line) + (1 if pages[-1] else 0)
+        pages[-1].append(line)
+
+    return list(map(
+        lambda page_iter_: "\n".join([
+            header_template.format(
+                num_failures=len(failures), page=page_iter_[0], num_pages=len(pages)
+            ),
+            *page_iter_[1],
+            footer
+        ]),
+        enumerate(pages, start=1)
+    ))
+
+
+async def write_comments(workflow_run_id: str, comments: List[str]):
+    """
+    Write the comments to the workflow run in order.
+
+    Writes are rate limited to one every COMMENT_MIN_INTERVAL_SECONDS, but we only wait
+    for whatever is left of the interval once the previous write has returned.
+
+    :param workflow_run_id: The workflow run orcabus id
+    :param comments: The list of comments to write
+    """
+    loop = asyncio.get_running_loop()
+    last_write_time = None
+    for comment in comments:
+        if last_write_time is not None:
+            remaining_interval = COMMENT_MIN_INTERVAL_SECONDS - (loop.time() - last_write_time)
+            if remaining_interval > 0:
+                await asyncio.sleep(remaining_interval)
+        last_write_time = loop.time()
+        await asyncio.to_thread(
+            add_comment_to_workflow_run,
+            workflow_run_orcabus_id=workflow_run_id,
+            comment=comment,
+            author=COMMENT_AUTHOR
+        )
+
+
 def validate_engine_parameters(
         engine_parameters: Dict,
         workflow_run_id: str,
@@ -97,7 +214,7 @@ def validate_engine_parameters(
         failures.append("projectId is not set")
         return False, failures
     try:
-        get_project_obj_from_project_id(project_id)
+        get_project_obj_from_project_id_cached(project_id)
     except ApiException:
         failures.append(f"Cannot find project id {project_id}")
         return False, failures
@@ -141,7 +258,7 @@ def validate_engine_parameters(
 
     # Confirm the pipeline is accessible in the project
     try:
-        _ = get_project_pipeline_obj(
+        _ = get_project_pipeline_obj_cached(
             project_id=project_id,
             pipeline_id=pipeline_id,
         )
@@ -153,6 +270,78 @@ def validate_engine_parameters(
     return True, []
 
 
+def check_uri_exists_in_filemanager(data_uri: str) -> Optional[str]:
+    """
+    Confirm a single data uri exists in the Filemanager.
+    :param data_uri: The file or folder (trailing slash) uri to check
+    :return: A failure comment if the uri cannot be found, otherwise None
+    """
+    # Check if it's a folder URI (ends with /)
+    if data_uri.endswith("/"):
+        # For folder URIs, verify at least 1 file exists under that prefix
+        parsed = urlparse(data_uri)
+        bucket = parsed.netloc
+        prefix = str(Path(parsed.path)).lstrip("/") + "/"
+        files = list_files_recursively(bucket, prefix)
+        if not (len(files) > 0):
+            return f"Folder URI '{data_uri}' has no files found under that prefix in the Filemanager"
+        return None
+
+    # For file URIs, confirm the file exists
+    try:
+        get_s3_object_id_from_s3_uri(data_uri)
+    except S3FileNotFoundError:
+        return f"Data URI '{data_uri}' cannot be found by the Filemanager, are you sure it exists?"
+    return None
+
+
+@ttl_lru_cache(PROJECT_DATA_CACHE_TTL_SECONDS, PROJECT_DATA_CACHE_MAXSIZE)
+def get_data_id_from_uri(data_uri: str) -> str:
+    """
+    Get the ICAv2 data id for a uri
+    :param data_uri: The data uri
+    :return: The data id
+    :raises ValueError: If the uri cannot be resolved to an ICAv2 data object
+    """
+    return coerce_data_id_or_uri_to_project_data_obj(
+        data_id_or_uri=data_uri,
+    ).data.id
+
+
+@ttl_lru_cache(PROJECT_DATA_CACHE_TTL_SECONDS, PROJECT_DATA_CACHE_MAXSIZE)
+def confirm_data_id_in_project(project_id: str, data_id: str) -> bool:
+    """
+    Confirm the data id is linked to the project
+    :param project_id: The ICAv2 project id
+    :param data_id: The data id
+    :return: True
+    :raises ApiException: If the data cannot be found in the project context
+    """
+    get_project_data_obj_by_id(
+        project_id=project_id,
+        data_id=data_id
+    )
+    return True
+
+
+def check_uri_in_project_context(data_uri: str, project_id: str) -> Optional[str]:
+    """
+    Confirm a data uri is linked to the ICAv2 project.
+    Confirmed (project id, data id) pairs are cached across warm invocations
+    :param data_uri: The data uri to check
+    :param project_id: The ICAv2 project id
+    :return: A failure comment if the uri is not in the project context, otherwise None
+    """
+    try:
+        # Try get the icav2 object by uri
+        data_id = get_data_id_from_uri(data_uri)
+        # Then try get it in this context
+        confirm_data_id_in_project(project_id, data_id)
+    except (ValueError, ApiException):
+        return f"Data URI '{data_uri}' cannot be found in the project context '{project_id}'"
+    return None
+
+
 def validate_inputs(
         inputs: Dict,
         project_id: str,
@@ -163,9 +352,11 @@ def validate_inputs(
 
     Performs two-phase validation:
     1. Filemanager existence check — confirms file/folder URIs exist at the S3 level
-       (excludes reference data bucket URIs since they are not indexed by the Filemanager)
+       (excludes reference data bucket URIs since they are not indexed by the Filemanager).
+       File URIs are resolved with one exact-key query per bucket, remaining checks are run concurrently, capped at VALIDATION_MAX_CONCURRENCY requests in flight
     2. ICA project context check — confirms URIs outside of ref/test/project-prefix
-       are linked to the project
+       are linked to the project. Checks are run concurrently and confirmed
+       (project id, data id) pairs are cached for PROJECT_DATA_CACHE_TTL_SECONDS
 
     :param inputs: The inputs to validate.
     :param project_id: The ICAv2 project id to validate against.
@@ -221,26 +412,27 @@ def validate_inputs(
         lambda uri: not uri.startswith(f"s3://{REF_DATA_BUCKET}/"),
         data_uris
     ))
-    for data_uri in non_reference_data_uris:
-        # Check if it's a folder URI (ends with /)
-        if data_uri.endswith("/"):
-            # For folder URIs, verify at least 1 file exists under that prefix
-            parsed = urlparse(data_uri)
-            bucket = parsed.netloc
-            prefix = str(Path(parsed.path)).lstrip("/") + "/"
-            files = list_files_recursively(bucket, prefix)
-            if not (len(files) > 0):
-                failures.append(
-                    f"Folder URI '{data_uri}' has no files found under that prefix in the Filemanager"
-                )
-        else:
-            # For file URIs, confirm the file exists
-            try:
-                get_s3_object_id_from_s3_uri(data_uri)
-            except S3FileNotFoundError:
-                failures.append(
-                    f"Data URI '{data_uri}' cannot be found by the Filemanager, are you sure it exists?"
-                )
+    # File URIs are resolved in bulk, one exact-key Filemanager query per bucket
+    file_object_by_s3_uri = get_file_objects_by_s3_uri(
+        list(filter(
+            lambda uri: not uri.endswith("/"),
+            non_reference_data_uris
+        )),
+        max_concurrency=MAX_CONCURRENCY
+    )
+
+    # Folder URIs, and any file URIs the bulk query did not return, are checked individually
+    # Checks run concurrently, executor.map returns results in input order
+    # so the failure messages remain deterministic
+    uris_to_check = list(filter(
+        lambda uri: uri not in file_object_by_s3_uri,
+        non_reference_data_uris
+    ))
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
+        failures.extend(filter(
+            lambda failure_iter_: failure_iter_ is not None,
+            executor.map(check_uri_exists_in_filemanager, uris_to_check)
+        ))
 
     # If Filemanager checks failed, return early
     if failures:
@@ -257,25 +449,15 @@ def validate_inputs(
         )
     ]
 
-    # Validate each URI is accessible in the project context
-    for data_uri in uris_to_validate:
-        # Try get the icav2 object by uri
-        try:
-            project_data_obj = coerce_data_id_or_uri_to_project_data_obj(
-                data_id_or_uri=data_uri,
+    # Validate each URI is accessible in the project context, concurrently and in input order
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
+        failures.extend(filter(
+            lambda failure_iter_: failure_iter_ is not None,
+            executor.map(
+                lambda data_uri_iter_: check_uri_in_project_context(data_uri_iter_, project_id),
+                uris_to_validate
             )
-        except ValueError:
-            failures.append(f"Data URI '{data_uri}' cannot be found in the project context '{project_id}'")
-            continue
-
-        # Then try get it in this context
-        try:
-            get_project_data_obj_by_id(
-                project_id=project_id,
-                data_id=project_data_obj.data.id
-            )
-        except ApiException:
-            failures.append(f"Data URI '{data_uri}' cannot be found in the project context '{project_id}'")
+        ))
 
     if failures:
         return False, failures
@@ -308,7 +490,7 @@ def handler(event, context) -> Dict[str, bool]:
       {"isValid": false}  — at least one check failed (comment written)
     """
     # Set env vars for ICAv2 access
-    set_icav2_env_vars()
+    set_icav2_env_vars_cached()
 
     # Get the event data
     payload_data = event.get('data')
@@ -332,7 +514,7 @@ def handler(event, context) -> Dict[str, bool]:
         )
         return {"isValid": False}
 
-    project_prefix = cast(str, get_s3_key_prefix_by_project_id(project_id))
+    project_prefix = cast(str, get_s3_key_prefix_by_project_id_cached(project_id))
 
     # Collect all failures
     all_failures: List[str] = []
@@ -355,39 +537,14 @@ def handler(event, context) -> Dict[str, bool]:
         )
         all_failures.extend(failures)
 
-    # Write failure comments
-    if all_failures:
-        if len(all_failures) == 1:
-            add_comment_to_workflow_run(
-                workflow_run_orcabus_id=workflow_run_id,
-                comment=_format_comment_with_arn(
-                    f"Post schema validation failed: {all_failures[0]}",
-                    execution_arn
-                ),
-                author=COMMENT_AUTHOR
-            )
-        else:
-            # Write a summary comment
-            add_comment_to_workflow_run(
-                workflow_run_orcabus_id=workflow_run_id,
-                comment=_format_comment_with_arn(
-                    f"Post schema validation failed for {len(all_failures)} reasons",
-                    execution_arn
-                ),
-                author=COMMENT_AUTHOR
-            )
-            # Write each failure as a separate numbered comment
-            for idx, failure in enumerate(all_failures, start=1):
-                add_comment_to_workflow_run(
-                    workflow_run_orcabus_id=workflow_run_id,
-                    comment=_format_comment_with_arn(
-                        f"Reason {idx} of {len(all_failures)}: {failure}",
-                        execution_arn
-                    ),
-                    author=COMMENT_AUTHOR
-                )
-                sleep(1)
+    logger.info(f"ICAv2 lookup cache stats: {CACHE_STATS}")
 
+    # Write failure comments, packed into as few comments as possible
+    if all_failures:
+        asyncio.run(write_comments(
+            workflow_run_id=workflow_run_id,
+            comments=pack_failure_comments(all_failures, execution_arn)
+        ))
         return {"isValid": False}
 
     return {"isValid": True}
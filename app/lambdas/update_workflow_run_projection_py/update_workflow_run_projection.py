@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+"""
+Keep the workflow run projection table up to date from the WorkflowRunStateChange events
+
+Triggered by every state change of this workflow (oncoanalyser-wgts-dna) and the upstream workflow (dragen-wgts-dna).
+
+The projection lets the workflow run lookups of the icav2 wes event handlers be single key reads
+rather than Workflow Manager API queries (convert_icav2_wes_event_to_wrsc_event and add_wes_failure_comment),
+those lambdas fall back to the API on a miss.
+The projection is updated after the fact, so it is only read for the fields of a run that do not change
+(see oncoanalyser_tools.workflow_run_projection).
+
+Items are keyed by id / id_type
+ - <portalRunId> / 'workflow_run'
+   The workflow run object, with the status and state_orcabus_id (the orcabusId of the current state) of the run
+
+The workflow run object is read from the Workflow Manager API when the event is received
+(the event does not carry the current state orcabus id, which the writes are conditional on),
+so the projection holds exactly what the API would have returned.
+That is the only Workflow Manager API request made per event.
+Writes are conditional on the state orcabus id, an older state never overwrites a newer one,
+so events may be delivered late, twice, or out of order.
+
+Set AWS_ENDPOINT_URL_DYNAMODB to point the lambda at a local DynamoDB (e.g. DynamoDB Local) for testing.
+"""
+
+# Standard imports
+import json
+import logging
+import typing
+from os import environ
+from typing import Dict
+
+from botocore.exceptions import ClientError
+
+# Layer imports
+from orcabus_api_tools.workflow import get_workflow_run_from_portal_run_id
+from oncoanalyser_tools.dynamodb import get_dynamodb_client
+
+# Model imports
+if typing.TYPE_CHECKING:
+    from orcabus_api_tools.workflow.models import WorkflowRunDetail
+    from mypy_boto3_dynamodb.type_defs import AttributeValueTypeDef
+
+# Globals
+WORKFLOW_RUN_PROJECTION_TABLE_NAME_ENV_VAR = "WORKFLOW_RUN_PROJECTION_TABLE_NAME"
+WORKFLOW_RUN_ID_TYPE = "workflow_run"
+
+# Only write the item if it is new, or we hold the same or a newer state of the run
+NEWER_STATE_CONDITION_EXPRESSION = "attribute_not_exists(id) OR state_orcabus_id <= :state_orcabus_id"
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+def get_table_name() -> str:
+    return environ[WORKFLOW_RUN_PROJECTION_TABLE_NAME_ENV_VAR]
+
+
+def get_workflow_run_item(workflow_run: 'WorkflowRunDetail') -> Dict[str, 'AttributeValueTypeDef']:
+    """
+    Get the projection item for a workflow run
+    :param workflow_run:
+    :return:
+    """
+    return {
+        "id": {"S": workflow_run['portalRunId']},
+        "id_type": {"S": WORKFLOW_RUN_ID_TYPE},
+        "workflow_run": {"S": json.dumps(workflow_run)},
+        "workflow_name": {"S": workflow_run['workflow']['name']},
+        "status": {"S": workflow_run['currentState']['status']},
+        "state_orcabus_id": {"S": workflow_run['currentState']['orcabusId']},
+    }
+
+
+def put_workflow_run(workflow_run: 'WorkflowRunDetail') -> bool:
+    """
+    Write the workflow run to the projection, unless the projection already holds a newer state of the run.
+    :param workflow_run:
+    :return: True if the projection was updated
+    """
+    try:
+        get_dynamodb_client().put_item(
+            TableName=get_table_name(),
+            Item=get_workflow_run_item(workflow_run),
+            ConditionExpression=NEWER_STATE_CONDITION_EXPRESSION,
+            ExpressionAttributeValues={":state_orcabus_id": {"S": workflow_run['currentState']['orcabusId']}},
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        logger.info(f"Projection already holds a newer state of {workflow_run['portalRunId']}, skipping")
+        return False
+
+    return True
+
+
+def handler(event, context):
+    """
+    Update the workflow run projection from a workflow run state change event
+
+    Input: the WorkflowRunStateChange event detail
+      {
+        "portalRunId": "20250101abcd1234",
+        "status": "DRAFT",
+        "workflow": {"name": "oncoanalyser-wgts-dna", ...},
+        ...
+      }
+
+    Output:
+      {
+        "portalRunId": "20250101abcd1234",
+        "status": "DRAFT",       # The current status of the run, may be newer than the event
+        "isUpdated": true        # False if the projection already held a newer state
+      }
+
+    :param event:
+    :param context:
+    :return:
+    """
+    portal_run_id = event['portalRunId']
+
+    # Get the current workflow run object
+    workflow_run: 'WorkflowRunDetail' = get_workflow_run_from_portal_run_id(portal_run_id)
+
+    # Write the current state of the run
+    is_updated = put_workflow_run(workflow_run)
+
+    return {
+        "portalRunId": portal_run_id,
+        "status": workflow_run['currentState']['status'],
+        "isUpdated": is_updated,
+    }
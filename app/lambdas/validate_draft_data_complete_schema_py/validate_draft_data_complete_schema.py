@@ -2,17 +2,22 @@
 
 """
 Download the draft schema, validate it against the current schema, and print the results.
+
+A single pass over the validation errors returns the verdict, the missing fields and the comment text.
 """
 
 # Standard imports
 import json
 import boto3
 import typing
-import jsonschema
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+from jsonschema import Draft202012Validator
+from jsonschema.exceptions import ValidationError, best_match
 from os import environ
-from typing import Dict
+from time import monotonic
+from typing import Any, Dict, List, Optional, TypedDict, Union
 import logging
-from jsonschema import ValidationError
 from pathlib import Path
 
 # Layer imports
@@ -29,12 +34,53 @@ SSM_SCHEMA_PATH_ENV_VAR = "SSM_SCHEMA_PATH"
 WORKFLOW_NAME_ENV_VAR = "WORKFLOW_NAME"
 COMMENT_AUTHOR = "{WORKFLOW_NAME}-workflow-validation-service"
 DEFAULT_PAYLOAD_VERSION_ENV_VAR = "DEFAULT_PAYLOAD_VERSION"
+SCHEMA_CACHE_TTL_ENV_VAR = "SCHEMA_CACHE_TTL_SECONDS"
+SCHEMA_SOURCE_ENV_VAR = "SCHEMA_SOURCE"
+
+# Where schemas are read from, 'registry' (SSM + Schemas registry, with the bundled copy as a fallback)
+# or 'bundled' (bundled copies only, no AWS calls, also usable for local load tests)
+SCHEMA_SOURCE_REGISTRY = "registry"
+SCHEMA_SOURCE_BUNDLED = "bundled"
+SCHEMA_SOURCE = environ.get(SCHEMA_SOURCE_ENV_VAR, SCHEMA_SOURCE_REGISTRY)
+
+# How long a compiled validator is used before we check the registry for a new schema version
+DEFAULT_SCHEMA_CACHE_TTL_SECONDS = 300
+SCHEMA_CACHE_TTL_SECONDS = int(environ.get(SCHEMA_CACHE_TTL_ENV_VAR, DEFAULT_SCHEMA_CACHE_TTL_SECONDS))
+
+# Copies of app/event-schemas/complete-data-draft/<payload-version>/ packaged with this lambda
+BUNDLED_SCHEMAS_DIR = Path(__file__).parent / "schemas" / "complete-data-draft"
+BUNDLED_SCHEMA_FILE_NAME = "complete-data-draft-schema.json"
+
+# Fail fast on a slow registry, we fall back to the bundled schema instead
+AWS_CLIENT_CONFIG = Config(
+    connect_timeout=2,
+    read_timeout=5,
+    retries={"max_attempts": 2, "mode": "standard"}
+)
 
 # Set up logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 
+class CachedSchemaValidator(TypedDict):
+    # None if the schema was loaded from the bundled copy
+    schemaVersion: Optional[str]
+    validator: Draft202012Validator
+    expiry: float
+
+
+class ValidationResult(TypedDict):
+    isValid: bool
+    missingFields: List[Union[Dict[str, Any], str]]
+    # None if the data is valid
+    comment: Optional[str]
+
+
+# Warm container cache of compiled validators, keyed by payload version
+SCHEMA_VALIDATOR_CACHE: Dict[str, CachedSchemaValidator] = {}
+
+
 def get_ssm_parameter_value(parameter_name: str) -> str:
     """
     Get the SSM parameter for the schema.
@@ -42,7 +88,7 @@ def get_ssm_parameter_value(parameter_name: str) -> str:
     """
 
     # Get the ssm client
-    ssm_client: SSMClient = boto3.client("ssm")
+    ssm_client: SSMClient = boto3.client("ssm", config=AWS_CLIENT_CONFIG)
 
     # Get the SSM parameter value
     response = ssm_client.get_parameter(
@@ -65,7 +111,7 @@ def get_schema_from_registry(
     """
 
     # Get the schemas client
-    schemas_client: SchemasClient = boto3.client("schemas")
+    schemas_client: SchemasClient = boto3.client("schemas", config=AWS_CLIENT_CONFIG)
 
     # Get the schema from the registry
     response = schemas_client.describe_schema(
@@ -76,43 +122,275 @@ def get_schema_from_registry(
     return response["Content"]
 
 
-def validate_draft_schema(
-        json_schema: str,
-        json_body: str,
-        workflow_run_id: str,
-        comment_error: bool = False
-) -> bool:
+def get_bundled_schema(payload_version: str) -> Dict:
+    """
+    Get the schema packaged with this lambda for the payload version.
+    :param payload_version: The payload version
+    :return: The schema as a dict
+    """
+    bundled_schema_path = BUNDLED_SCHEMAS_DIR / payload_version / BUNDLED_SCHEMA_FILE_NAME
+    if not bundled_schema_path.is_file():
+        raise ValueError(f"No bundled schema found for payload version '{payload_version}'")
+    return json.loads(bundled_schema_path.read_text())
+
+
+def get_bundled_schema_validators() -> Dict[str, Draft202012Validator]:
     """
-    Download the draft schema, validate it against the current schema, and print the results.
+    Compile a validator for every schema bundled with this lambda
+    :return: A dict of payload version to compiled validator
+    """
+    return dict(map(
+        lambda bundled_schema_dir_iter_: (
+            bundled_schema_dir_iter_.name,
+            Draft202012Validator(get_bundled_schema(bundled_schema_dir_iter_.name))
+        ),
+        sorted(filter(
+            lambda bundled_schema_dir_iter_: (bundled_schema_dir_iter_ / BUNDLED_SCHEMA_FILE_NAME).is_file(),
+            BUNDLED_SCHEMAS_DIR.iterdir()
+        ))
+    ))
+
+
+# In bundled mode, compile every validator once at import time (during the lambda init phase)
+BUNDLED_SCHEMA_VALIDATORS: Dict[str, Draft202012Validator] = (
+    get_bundled_schema_validators()
+    if SCHEMA_SOURCE == SCHEMA_SOURCE_BUNDLED
+    else {}
+)
 
-    :param json_schema: The current schema as a JSON string.
-    :param json_body: The draft schema as a JSON string.
-    :param workflow_run_id: The workflow run ID to add comments to (if any).
-    :param comment_error: Whether to add a comment to the workflow run on validation error.
+
+def get_schema_validator(payload_version: str) -> Draft202012Validator:
     """
+    Get the compiled validator for a payload version.
+
+    In bundled mode, the validator precompiled at import time is returned.
+    Otherwise, validators are cached for SCHEMA_CACHE_TTL_SECONDS. Once expired, we re-read the SSM schema pointer
+    and only re-download and recompile the schema if its schemaVersion has changed.
+    If the registry cannot be reached, we keep using a previously cached validator,
+    or fall back to the schema bundled with this lambda.
+
+    :param payload_version: The payload version
+    :return: The compiled validator
+    """
+    # Bundled mode, no SSM or Schemas registry calls
+    if SCHEMA_SOURCE == SCHEMA_SOURCE_BUNDLED:
+        if payload_version not in BUNDLED_SCHEMA_VALIDATORS:
+            raise ValueError(f"No bundled schema found for payload version '{payload_version}'")
+        return BUNDLED_SCHEMA_VALIDATORS[payload_version]
+
+    cached_validator = SCHEMA_VALIDATOR_CACHE.get(payload_version)
+    if cached_validator is not None and cached_validator['expiry'] > monotonic():
+        return cached_validator['validator']
+
     try:
-        jsonschema.validate(
-            instance=json.loads(json_body),
-            schema=json.loads(json_schema),
+        # Get the SSM parameters
+        schema_registry = get_ssm_parameter_value(environ[SSM_REGISTRY_NAME_ENV_VAR])
+        schema_pointer = json.loads(get_ssm_parameter_value(
+            str(Path(environ[SSM_SCHEMA_PATH_ENV_VAR]) / payload_version)
+        ))
+        schema_version = schema_pointer.get('schemaVersion')
+
+        # Schema version is unchanged, keep the compiled validator
+        if (
+                cached_validator is not None and
+                schema_version is not None and
+                cached_validator['schemaVersion'] == schema_version
+        ):
+            cached_validator['expiry'] = monotonic() + SCHEMA_CACHE_TTL_SECONDS
+            return cached_validator['validator']
+
+        # Get the current schema from the schema registry
+        schema = json.loads(get_schema_from_registry(
+            registry_name=schema_registry,
+            schema_name=schema_pointer['schemaName']
+        ))
+    except (BotoCoreError, ClientError) as e:
+        if cached_validator is not None:
+            logger.warning(f"Could not refresh schema for payload version {payload_version}, using cached schema: {e}")
+            return cached_validator['validator']
+        logger.warning(f"Could not get schema for payload version {payload_version}, using bundled schema: {e}")
+        schema = get_bundled_schema(payload_version)
+        schema_version = None
+
+    # The schema is trusted, so we do not re-check it against the metaschema
+    validator = Draft202012Validator(schema)
+    SCHEMA_VALIDATOR_CACHE[payload_version] = {
+        "schemaVersion": schema_version,
+        "validator": validator,
+        "expiry": monotonic() + SCHEMA_CACHE_TTL_SECONDS,
+    }
+    return validator
+
+
+def resolve_schema_ref(schema: Dict, ref: str) -> Dict:
+    """
+    Resolve a local JSON schema $ref like '#/$defs/FastqInputs'.
+    """
+    if not ref.startswith("#/"):
+        return {}
+
+    resolved = schema
+    for ref_part in ref.lstrip("#/").split("/"):
+        resolved = resolved.get(ref_part, {})
+
+    return resolved
+
+
+def get_missing_required_fields_for_schema_option(
+        schema_option: Dict,
+        instance: Dict,
+        path: str
+) -> List[str]:
+    """
+    Given a resolved oneOf schema option, return the missing required field paths.
+    """
+    missing_fields = []
+
+    for required_field in schema_option.get("required", []):
+        if not isinstance(instance, dict) or required_field not in instance:
+            field_path = f"{path}.{required_field}" if path else required_field
+            missing_fields.append(field_path)
+
+    return missing_fields
+
+
+def get_one_of_missing_field_summaries(
+        schema: Dict,
+        error: ValidationError,
+        path: str
+) -> List[Dict[str, List[str]]]:
+    """
+    Summarise oneOf validation failures without exposing every nested conditional.
+
+    Assumes oneOf options are $ref objects. For each referenced option, collect the
+    missing required fields. Then pair equivalent missing fields into concise
+    'either X or Y' messages.
+    """
+    missing_field_options = []
+
+    for idx, option in enumerate(error.validator_value, start=1):
+        if not (isinstance(option, dict) and "$ref" in option):
+            continue
+
+        resolved_option = resolve_schema_ref(schema, option["$ref"])
+        option_missing_fields = get_missing_required_fields_for_schema_option(
+            resolved_option,
+            error.instance,
+            path
         )
-    except ValidationError as e:
-        logger.info(f"Failed validation, {e}")
-        if comment_error:
-            add_comment_to_workflow_run(
-                workflow_run_orcabus_id=workflow_run_id,
-                comment=f"Draft schema validation failed: {e.message} at \"{e.json_path}\"",
-                author=COMMENT_AUTHOR.format(
-                    WORKFLOW_NAME=environ.get(WORKFLOW_NAME_ENV_VAR)
-                )
+
+        if option_missing_fields:
+            missing_field_options.append(
+                {
+                    f'{path}: {option["$ref"].rsplit("/")[-1]} path': option_missing_fields
+                }
             )
-        return False
-    return True
+
+    return missing_field_options
 
 
-def handler(event, context) -> Dict[str, bool]:
+def get_missing_fields_from_errors(
+        schema: Dict,
+        errors: List[ValidationError]
+) -> List[Union[Dict[str, Any], str]]:
+    """
+    Convert the validation errors into the list of missing / invalid fields.
+
+    Missing required properties are listed by their path, oneOf failures are summarised
+    by get_one_of_missing_field_summaries and any other error is listed with a short message.
+    String entries are deduplicated and sorted, oneOf summaries are appended at the end.
+
+    :param schema: The schema the errors were raised against
+    :param errors: The validation errors
+    :return: The list of missing fields
+    """
+    missing_fields: List[Union[Dict[str, Any], str]] = []
+    for error in errors:
+        path = ".".join(str(p) for p in error.absolute_path) if error.absolute_path else ""
+        if error.validator == "required":
+            # For required errors, list each missing property
+            for missing_prop in error.validator_value:
+                if missing_prop not in error.instance:
+                    field_path = f"{path}.{missing_prop}" if path else missing_prop
+                    missing_fields.append(field_path)
+        elif error.validator == "oneOf":
+            missing_fields.append(
+                {
+                    "oneOf": get_one_of_missing_field_summaries(
+                        schema,
+                        error,
+                        path
+                    )
+                }
+            )
+        else:
+            # For other errors (type, pattern, etc.)
+            if path:
+                missing_fields.append(f"{path} ({error.message[:50]})")
+
+    # Reduce string duplicates
+    missing_fields_str = sorted(set(list(filter(
+        lambda missing_field_iter: isinstance(missing_field_iter, str),
+        missing_fields
+    ))))
+
+    return missing_fields_str + list(filter(
+        lambda missing_field_iter: isinstance(missing_field_iter, dict),
+        missing_fields
+    ))
+
+
+def validate_draft_schema(
+        validator: Draft202012Validator,
+        payload_data: Dict
+) -> ValidationResult:
+    """
+    Validate the draft data against the current schema in a single pass over the validation errors.
+
+    The same list of errors gives the verdict, the comment text (the error jsonschema.validate would raise)
+    and the missing fields.
+
+    :param validator: The compiled validator for the current schema.
+    :param payload_data: The draft data.
+    :return: The validation result
+    """
+    errors = list(validator.iter_errors(payload_data))
+    if not errors:
+        return {
+            "isValid": True,
+            "missingFields": [],
+            "comment": None,
+        }
+
+    # Same error selection as jsonschema.validate
+    e = best_match(errors)
+    logger.info(f"Failed validation, {e}")
+
+    return {
+        "isValid": False,
+        "missingFields": get_missing_fields_from_errors(validator.schema, errors),
+        "comment": f"Draft schema validation failed: {e.message} at \"{e.json_path}\"",
+    }
+
+
+def handler(event, context) -> ValidationResult:
     """
     Given a draft schema, validate it against the current schema and print the results.
-    :return:
+
+    Input:
+    {
+        "data": {...},
+        "payloadVersion": "2025.08.05",  (optional)
+        "workflowRunId": "wfr.123",  (optional)
+        "addCommentOnError": false  (optional)
+    }
+
+    Output:
+    {
+        "isValid": false,
+        "missingFields": ["inputs.sequenceData", "inputs.reference", ...],
+        "comment": "Draft schema validation failed: ..."
+    }
     """
     # Get the event data
     payload_version = event.get("payloadVersion", environ[DEFAULT_PAYLOAD_VERSION_ENV_VAR])
@@ -120,28 +398,20 @@ def handler(event, context) -> Dict[str, bool]:
     workflow_run_id = event.get("workflowRunId", "")
     comment_error = event.get("addCommentOnError", False)
 
-    # Get the SSM parameters
-    schema_registry = get_ssm_parameter_value(environ[SSM_REGISTRY_NAME_ENV_VAR])
-    schema_name = json.loads(get_ssm_parameter_value(
-        str(Path(environ[SSM_SCHEMA_PATH_ENV_VAR]) / payload_version)
-    ))['schemaName']
-
-    # Get the current schema from the schema registry
-    current_schema = get_schema_from_registry(
-        registry_name=schema_registry,
-        schema_name=schema_name
-    )
-
     # Validate the draft schema against the current schema
-    is_valid_schema = validate_draft_schema(
-        current_schema,
-        # Assuming the event contains the draft schema as a JSON string
-        json.dumps(payload_data),
-        workflow_run_id=workflow_run_id,
-        comment_error=comment_error
+    validation_result = validate_draft_schema(
+        get_schema_validator(payload_version),
+        payload_data
     )
 
-    # Return if the schema is not valid
-    return {
-        "isValid": is_valid_schema
-    }
+    # Add the comment if the schema is not valid
+    if not validation_result["isValid"] and comment_error:
+        add_comment_to_workflow_run(
+            workflow_run_orcabus_id=workflow_run_id,
+            comment=validation_result["comment"],
+            author=COMMENT_AUTHOR.format(
+                WORKFLOW_NAME=environ.get(WORKFLOW_NAME_ENV_VAR)
+            )
+        )
+
+    return validation_result
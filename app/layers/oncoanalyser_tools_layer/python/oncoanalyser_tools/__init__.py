@@ -0,0 +1,7 @@
+#!/usr/bin/env python3
+
+"""
+Helpers shared by the oncoanalyser wgts dna lambdas
+
+Pure python, boto3 is provided by the lambda runtime and orcabus_api_tools by its own layer.
+"""
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+"""
+In-memory caches that live for the life of a warm lambda container
+"""
+
+# Standard imports
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
+from time import monotonic
+from typing import Dict, Callable, Any
+
+# Hit / miss counters for each cached function, keyed by function name
+CACHE_STATS: Dict[str, Dict[str, int]] = {}
+
+
+def ttl_lru_cache(ttl_seconds: int, maxsize: int) -> Callable[[Callable], Callable]:
+    """
+    Memoise a function for the life of a warm container.
+
+    Entries expire after ttl_seconds and the least recently used entry is evicted once
+    the cache holds more than maxsize entries. Exceptions are not cached, so failed lookups are retried.
+    Hits and misses are counted in CACHE_STATS under the function name.
+
+    :param ttl_seconds: How long a result is reused for
+    :param maxsize: The maximum number of results held
+    :return: The decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        cache: OrderedDict = OrderedDict()
+        lock = Lock()
+        stats = CACHE_STATS.setdefault(func.__name__, {"hits": 0, "misses": 0})
+
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            key = (args, tuple(sorted(kwargs.items())))
+            with lock:
+                cached = cache.get(key)
+                if cached is not None and cached[1] > monotonic():
+                    cache.move_to_end(key)
+                    stats["hits"] += 1
+                    return cached[0]
+                stats["misses"] += 1
+
+            value = func(*args, **kwargs)
+
+            with lock:
+                cache[key] = (value, monotonic() + ttl_seconds)
+                cache.move_to_end(key)
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return value
+
+        return wrapper
+
+    return decorator
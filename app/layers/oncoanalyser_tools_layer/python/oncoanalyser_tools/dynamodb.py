@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+
+"""
+DynamoDB client for the lookups that read through a DynamoDB table
+
+Calls fail fast, the readers fall back to the request the table stands in for
+(the workflow run projection writer raises, and the event is retried).
+Set AWS_ENDPOINT_URL_DYNAMODB to point the client at a local DynamoDB (e.g. DynamoDB Local).
+"""
+
+# Standard imports
+import typing
+from functools import lru_cache
+
+import boto3
+from botocore.config import Config
+
+# Model imports
+if typing.TYPE_CHECKING:
+    from mypy_boto3_dynamodb import DynamoDBClient
+
+# Globals
+AWS_CLIENT_CONFIG = Config(
+    connect_timeout=2,
+    read_timeout=5,
+    retries={"max_attempts": 2, "mode": "standard"},
+)
+
+
+@lru_cache(maxsize=1)
+def get_dynamodb_client() -> 'DynamoDBClient':
+    return boto3.client('dynamodb', config=AWS_CLIENT_CONFIG)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+"""
+Memoise requests within one state machine execution (see the execution cache table)
+
+Items are keyed by the arn of the calling state machine execution and a hash of the request,
+and expire after EXECUTION_CACHE_TTL_SECONDS.
+Only memoise requests whose result cannot change (or where a stale result does not matter) within an execution.
+"""
+
+# Standard imports
+import json
+import logging
+from hashlib import sha256
+from os import environ
+from time import time
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+# Local imports
+from .dynamodb import get_dynamodb_client
+
+# Globals
+EXECUTION_CACHE_TABLE_NAME_ENV_VAR = "EXECUTION_CACHE_TABLE_NAME"
+EXECUTION_CACHE_TTL_SECONDS_ENV_VAR = "EXECUTION_CACHE_TTL_SECONDS"
+DEFAULT_EXECUTION_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+logger = logging.getLogger()
+
+T = TypeVar('T')
+
+
+def get_request_hash(request_name: str, request: Dict[str, Any]) -> str:
+    return sha256(
+        json.dumps({"requestName": request_name, "request": request}, sort_keys=True).encode()
+    ).hexdigest()
+
+
+def execution_memo(
+        execution_arn: Optional[str],
+        request_name: str,
+        request: Dict[str, Any],
+        func: Callable[[], T]
+) -> T:
+    """
+    Read the result of a request through the execution cache.
+
+    The cache is skipped if there is no execution arn (or no table), and any cache error falls back to the request.
+    :param execution_arn: The arn of the calling state machine execution
+    :param request_name: The name of the lookup
+    :param request: The (json serialisable) lookup arguments
+    :param func: Makes the request, called on a miss
+    :return:
+    """
+    table_name = environ.get(EXECUTION_CACHE_TABLE_NAME_ENV_VAR, None)
+    if execution_arn is None or table_name is None:
+        return func()
+
+    cache_key = {
+        "execution_arn": {"S": execution_arn},
+        "request_hash": {"S": get_request_hash(request_name, request)},
+    }
+
+    try:
+        cache_item = get_dynamodb_client().get_item(
+            TableName=table_name,
+            Key=cache_key,
+            ConsistentRead=True,
+        ).get('Item', None)
+        if cache_item is not None:
+            return json.loads(cache_item['result']['S'])
+    except (BotoCoreError, ClientError) as e:
+        logger.warning(f"Could not read the execution cache: {e}")
+
+    result = func()
+
+    try:
+        get_dynamodb_client().put_item(
+            TableName=table_name,
+            Item={
+                **cache_key,
+                "result": {"S": json.dumps(result)},
+                "expire_at": {"N": str(int(time()) + int(environ.get(
+                    EXECUTION_CACHE_TTL_SECONDS_ENV_VAR, DEFAULT_EXECUTION_CACHE_TTL_SECONDS
+                )))},
+            },
+        )
+    except (BotoCoreError, ClientError) as e:
+        logger.warning(f"Could not write to the execution cache: {e}")
+
+    return result
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+"""
+Resolve fastq rgids to fastq ids in O(libraries) requests rather than O(rgids)
+
+All fastqs of each library are collected in one (paged) query per library and indexed by rgid,
+any rgid not found in the library fastqs is resolved with its own get_fastq_by_rgid lookup.
+Library fastqs missing an rgid field (index, lane or instrumentRunId) are skipped rather than failing the lookup.
+
+Needs the orcabus_api_tools layer.
+"""
+
+# Standard imports
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Callable, Dict, List, Optional
+
+# Layer imports
+from orcabus_api_tools.fastq import get_fastq_by_rgid, get_fastqs_in_library
+from orcabus_api_tools.fastq.models import Fastq
+
+# Globals
+MAX_CONCURRENCY = 8
+# The fastq fields an rgid is made from
+FASTQ_RGID_FIELDS = ['index', 'lane', 'instrumentRunId']
+
+
+def get_rgid_from_fastq_obj(fastq_obj: Fastq) -> Optional[str]:
+    """
+    Get the rgid of a fastq, None if the fastq is missing any of the rgid fields
+    :param fastq_obj:
+    :return:
+    """
+    if any(map(
+        lambda field_iter_: fastq_obj.get(field_iter_, None) is None,
+        FASTQ_RGID_FIELDS
+    )):
+        return None
+
+    return ".".join([
+        fastq_obj['index'],
+        str(fastq_obj['lane']),
+        fastq_obj['instrumentRunId']
+    ])
+
+
+def get_library_fastqs(
+        library_id_list: List[str],
+        fetch_library_fastqs: Callable[[str], List[Fastq]] = get_fastqs_in_library
+) -> List[Fastq]:
+    """
+    Collect the fastqs for each library concurrently, one call to fetch_library_fastqs per library.
+
+    :param library_id_list: The library ids
+    :param fetch_library_fastqs: Gets the fastqs of a single library, get_fastqs_in_library by default
+    :return: The fastqs of all libraries
+    """
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
+        return list(chain.from_iterable(executor.map(
+            fetch_library_fastqs,
+            sorted(set(library_id_list))
+        )))
+
+
+def get_fastq_id_by_rgid_map(
+        fastq_rgid_list: List[str],
+        library_fastqs: List[Fastq]
+) -> Dict[str, str]:
+    """
+    Resolve a list of rgids to their fastq ids.
+
+    :param fastq_rgid_list: The rgids to resolve
+    :param library_fastqs: The fastqs of the libraries the rgids belong to (see get_library_fastqs)
+    :return: The fastq id for each rgid
+    """
+    fastq_rgid_set = set(fastq_rgid_list)
+
+    # Index the library fastqs by rgid,
+    # fastqs that cannot form an rgid are skipped, their rgids are left to the single rgid lookups
+    fastq_ids_by_rgid: Dict[str, List[str]] = {}
+    for fastq_obj in library_fastqs:
+        rgid = get_rgid_from_fastq_obj(fastq_obj)
+        if rgid in fastq_rgid_set:
+            fastq_ids_by_rgid.setdefault(rgid, []).append(fastq_obj['id'])
+
+    # An rgid is only resolved from the index if it matches exactly one fastq
+    fastq_id_by_rgid_map = dict(map(
+        lambda kv_iter_: (kv_iter_[0], kv_iter_[1][0]),
+        filter(
+            lambda kv_iter_: len(set(kv_iter_[1])) == 1,
+            fastq_ids_by_rgid.items()
+        )
+    ))
+
+    # Fall back to single rgid lookups for anything else
+    unresolved_rgid_list = sorted(fastq_rgid_set - set(fastq_id_by_rgid_map.keys()))
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
+        fastq_id_by_rgid_map.update(dict(zip(
+            unresolved_rgid_list,
+            executor.map(
+                lambda fastq_rgid_iter_: get_fastq_by_rgid(fastq_rgid_iter_)['id'],
+                unresolved_rgid_list
+            )
+        )))
+
+    return fastq_id_by_rgid_map
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+"""
+Resolve many s3 uris against the Filemanager at once
+
+The keys are queried together by exact match, one Filemanager query per bucket
+(split into chunks of FILEMANAGER_KEY_CHUNK_SIZE keys to bound the request url length),
+so a run's worth of files costs one request per bucket rather than one per file.
+Files can also be looked up by ingest id, to find the copies of a file in another bucket.
+Exact keys are used rather than a shared key prefix, a prefix query would list every object under the
+prefix (thousands for a dragen output folder) to confirm a handful of files.
+
+Needs the orcabus_api_tools layer.
+"""
+
+# Standard imports
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Dict, List, Union
+from urllib.parse import urlparse
+
+# Layer imports
+from orcabus_api_tools.filemanager import get_file_manager_request_response_results
+from orcabus_api_tools.filemanager.models import FileObject
+
+# Globals
+# Number of keys (or ingest ids) per bulk Filemanager query
+FILEMANAGER_KEY_CHUNK_SIZE = 50
+MAX_CONCURRENCY = 8
+
+
+def query_in_chunks(
+        query_params_list: List[Dict[str, Union[str, List[str]]]],
+        max_concurrency: int = MAX_CONCURRENCY
+) -> List[FileObject]:
+    """
+    Run each (current state) api/v1/s3 query concurrently, and concatenate their results
+    :param query_params_list:
+    :param max_concurrency: The maximum number of Filemanager requests in flight
+    :return:
+    """
+    if not query_params_list:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        return list(chain.from_iterable(executor.map(
+            lambda query_params_iter_: get_file_manager_request_response_results(
+                endpoint="api/v1/s3",
+                params={
+                    **query_params_iter_,
+                    "currentState": "true",
+                }
+            ),
+            query_params_list
+        )))
+
+
+def get_file_objects_by_s3_uri(
+        s3_uri_list: List[str],
+        max_concurrency: int = MAX_CONCURRENCY
+) -> Dict[str, FileObject]:
+    """
+    Resolve a list of file uris against the Filemanager in bulk, the chunks are queried concurrently.
+
+    :param s3_uri_list: The list of file uris to resolve
+    :param max_concurrency: The maximum number of Filemanager requests in flight
+    :return: A dict of s3 uri to (current state) file object, uris that could not be found are omitted
+    """
+    # Group the keys by their bucket (dict keys keep the first-seen order)
+    keys_by_bucket: Dict[str, Dict[str, None]] = {}
+    for s3_uri in s3_uri_list:
+        parsed = urlparse(s3_uri)
+        keys_by_bucket.setdefault(parsed.netloc, {})[parsed.path.lstrip("/")] = None
+
+    # Repeated key parameters are combined with OR
+    query_params_list = []
+    for bucket, key_dict in keys_by_bucket.items():
+        key_list = list(key_dict.keys())
+        for chunk_start in range(0, len(key_list), FILEMANAGER_KEY_CHUNK_SIZE):
+            query_params_list.append({
+                "bucket": bucket,
+                "key": key_list[chunk_start:chunk_start + FILEMANAGER_KEY_CHUNK_SIZE],
+            })
+
+    # Index the results by uri
+    s3_uri_set = set(s3_uri_list)
+    file_object_by_s3_uri: Dict[str, FileObject] = {}
+    for file_object in query_in_chunks(query_params_list, max_concurrency=max_concurrency):
+        s3_uri = f"s3://{file_object['bucket']}/{file_object['key']}"
+        if s3_uri in s3_uri_set:
+            file_object_by_s3_uri[s3_uri] = file_object
+
+    return file_object_by_s3_uri
+
+
+def get_file_objects_by_ingest_id(
+        ingest_id_list: List[str],
+        bucket: str,
+        max_concurrency: int = MAX_CONCURRENCY
+) -> Dict[str, List[FileObject]]:
+    """
+    Find the copies of a list of files (by ingest id) in a bucket, in bulk
+
+    :param ingest_id_list: The ingest ids to find
+    :param bucket: The bucket to look in
+    :param max_concurrency: The maximum number of Filemanager requests in flight
+    :return: A dict of ingest id to the (current state) file objects in the bucket, ingest ids not found are omitted
+    """
+    # Repeated ingest id parameters are combined with OR
+    unique_ingest_id_list = list(dict.fromkeys(ingest_id_list))
+    query_params_list = list(map(
+        lambda chunk_start_iter_: {
+            "bucket": bucket,
+            "ingestId": unique_ingest_id_list[chunk_start_iter_:chunk_start_iter_ + FILEMANAGER_KEY_CHUNK_SIZE],
+        },
+        range(0, len(unique_ingest_id_list), FILEMANAGER_KEY_CHUNK_SIZE)
+    ))
+
+    file_objects_by_ingest_id: Dict[str, List[FileObject]] = {}
+    for file_object in query_in_chunks(query_params_list, max_concurrency=max_concurrency):
+        if file_object.get('ingestId') is not None:
+            file_objects_by_ingest_id.setdefault(file_object['ingestId'], []).append(file_object)
+
+    return file_objects_by_ingest_id
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+"""
+Read workflow runs from the workflow run projection table (see update_workflow_run_projection)
+
+The projection is updated after the fact, by the same WorkflowRunStateChange events that start the state machines,
+so it may hold an older state of a run.
+Only read fields of a run that never change from it (orcabusId, workflowRunName, workflow),
+anything depending on the current state (currentState, libraries of a DRAFT run) must be read from the API.
+
+Needs the orcabus_api_tools layer.
+"""
+
+# Standard imports
+import json
+import logging
+import typing
+from os import environ
+from typing import List, Optional
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+# Layer imports
+from orcabus_api_tools.workflow import get_workflow_run_from_portal_run_id
+
+# Local imports
+from .dynamodb import get_dynamodb_client
+
+# Model imports
+if typing.TYPE_CHECKING:
+    from orcabus_api_tools.workflow.models import WorkflowRunDetail
+
+# Globals
+WORKFLOW_RUN_PROJECTION_TABLE_NAME_ENV_VAR = "WORKFLOW_RUN_PROJECTION_TABLE_NAME"
+WORKFLOW_RUN_ID_TYPE = "workflow_run"
+
+logger = logging.getLogger()
+
+
+def get_workflow_run_from_projection(portal_run_id: str) -> Optional['WorkflowRunDetail']:
+    """
+    Get the workflow run from the workflow run projection table, None on a miss
+    :param portal_run_id:
+    :return:
+    """
+    table_name = environ.get(WORKFLOW_RUN_PROJECTION_TABLE_NAME_ENV_VAR, None)
+    if table_name is None:
+        return None
+
+    try:
+        workflow_run_item = get_dynamodb_client().get_item(
+            TableName=table_name,
+            Key={
+                "id": {"S": portal_run_id},
+                "id_type": {"S": WORKFLOW_RUN_ID_TYPE},
+            },
+            ConsistentRead=True,
+        ).get('Item', None)
+    except (BotoCoreError, ClientError) as e:
+        logger.warning(f"Could not read the workflow run projection: {e}")
+        return None
+
+    if workflow_run_item is None:
+        return None
+
+    return json.loads(workflow_run_item['workflow_run']['S'])
+
+
+def get_workflow_run(
+        portal_run_id: str,
+        fallback_status_list: Optional[List[str]] = None
+) -> 'WorkflowRunDetail':
+    """
+    Get the workflow run from the projection, or from the Workflow Manager API on a miss.
+    The state of the run may be stale, see the module docstring
+    :param portal_run_id:
+    :param fallback_status_list: Also query the API if the projected run is in one of these states
+    :return:
+    """
+    workflow_run = get_workflow_run_from_projection(portal_run_id)
+
+    if workflow_run is None:
+        logger.info(f"Workflow run {portal_run_id} not in the projection, querying the Workflow Manager API")
+        return get_workflow_run_from_portal_run_id(portal_run_id)
+
+    if workflow_run['currentState']['status'] in (fallback_status_list or []):
+        logger.info(
+            f"Workflow run {portal_run_id} is {workflow_run['currentState']['status']} in the projection, "
+            f"querying the Workflow Manager API"
+        )
+        return get_workflow_run_from_portal_run_id(portal_run_id)
+
+    return workflow_run
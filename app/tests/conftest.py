@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+"""
+Shared fixtures for the lambda tests
+
+The lambdas are imported from their own directories, as they are in the lambda runtime.
+The Workflow Manager API is never called, the tests patch the orcabus_api_tools functions a lambda uses,
+so the orcabus_api_tools layer only needs to be importable (a placeholder module is registered if it is not installed).
+
+DynamoDB calls are made against DynamoDB Local if AWS_ENDPOINT_URL_DYNAMODB is set
+(a table is created and dropped per test), otherwise against an in-memory table.
+
+Usage:
+    python -m pytest app/tests
+    AWS_ENDPOINT_URL_DYNAMODB=http://localhost:8000 python -m pytest app/tests
+"""
+
+# Standard imports
+import sys
+from os import environ
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, Tuple
+from uuid import uuid4
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+
+APP_DIR = Path(__file__).parent.parent
+
+sys.path.append(str(APP_DIR / "layers" / "oncoanalyser_tools_layer" / "python"))
+for lambda_dir in (APP_DIR / "lambdas").iterdir():
+    sys.path.append(str(lambda_dir))
+
+try:
+    import orcabus_api_tools.workflow  # noqa: F401
+except ImportError:
+    for module_name in ["orcabus_api_tools", "orcabus_api_tools.workflow"]:
+        sys.modules[module_name] = ModuleType(module_name)
+    sys.modules["orcabus_api_tools.workflow"].get_workflow_run_from_portal_run_id = None
+
+
+class InMemoryDynamoDBClient:
+    """
+    The low level dynamodb client calls made by the workflow run projection, against a dict.
+    Only the condition expression of update_workflow_run_projection is supported.
+    """
+    def __init__(self, condition_expression: str):
+        self.items: Dict[Tuple[str, str], Dict] = {}
+        self.condition_expression = condition_expression
+
+    @staticmethod
+    def get_key(item: Dict) -> Tuple[str, str]:
+        return item['id']['S'], item['id_type']['S']
+
+    def check_condition(self, operation_name: str, item, condition_expression, expression_attribute_values):
+        if condition_expression is None:
+            return
+
+        if condition_expression != self.condition_expression:
+            raise NotImplementedError(condition_expression)
+
+        if not (
+            item is None or
+            item['state_orcabus_id']['S'] <= expression_attribute_values[':state_orcabus_id']['S']
+        ):
+            raise ClientError(
+                {"Error": {"Code": "ConditionalCheckFailedException", "Message": "The conditional request failed"}},
+                operation_name
+            )
+
+    def get_item(self, TableName, Key, ConsistentRead=False):
+        item = self.items.get(self.get_key(Key), None)
+        return {"Item": item} if item is not None else {}
+
+    def put_item(self, TableName, Item, ConditionExpression=None, ExpressionAttributeValues=None):
+        self.check_condition(
+            'PutItem', self.items.get(self.get_key(Item), None), ConditionExpression, ExpressionAttributeValues
+        )
+        self.items[self.get_key(Item)] = Item
+        return {}
+
+
+@pytest.fixture
+def workflow_run_projection_table(monkeypatch):
+    """
+    An empty workflow run projection table, yields the dynamodb client and the table name
+    """
+    import update_workflow_run_projection
+
+    table_name = f"workflow-run-projection-test-{uuid4().hex[:8]}"
+    monkeypatch.setenv(update_workflow_run_projection.WORKFLOW_RUN_PROJECTION_TABLE_NAME_ENV_VAR, table_name)
+
+    if environ.get("AWS_ENDPOINT_URL_DYNAMODB", None) is None:
+        dynamodb_client = InMemoryDynamoDBClient(update_workflow_run_projection.NEWER_STATE_CONDITION_EXPRESSION)
+        monkeypatch.setattr(update_workflow_run_projection, "get_dynamodb_client", lambda: dynamodb_client)
+        yield dynamodb_client, table_name
+        return
+
+    # Same key schema as infrastructure/stage/dynamodb
+    dynamodb_client = boto3.client("dynamodb")
+    dynamodb_client.create_table(
+        TableName=table_name,
+        KeySchema=[
+            {"AttributeName": "id", "KeyType": "HASH"},
+            {"AttributeName": "id_type", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "id", "AttributeType": "S"},
+            {"AttributeName": "id_type", "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    dynamodb_client.get_waiter("table_exists").wait(TableName=table_name)
+    monkeypatch.setattr(update_workflow_run_projection, "get_dynamodb_client", lambda: dynamodb_client)
+    try:
+        yield dynamodb_client, table_name
+    finally:
+        dynamodb_client.delete_table(TableName=table_name)
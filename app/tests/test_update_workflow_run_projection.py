@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the update_workflow_run_projection lambda
+
+Covers the conditional writes (an older state never overwrites a newer one),
+and the Workflow Manager API requests made per event.
+"""
+
+# Standard imports
+import json
+from copy import deepcopy
+from typing import Dict, List, Optional
+
+import pytest
+
+# Lambda imports
+import update_workflow_run_projection
+from update_workflow_run_projection import (
+    handler,
+    put_workflow_run,
+    WORKFLOW_RUN_ID_TYPE,
+)
+
+WORKFLOW_NAME = "dragen-wgts-dna"
+
+
+def get_workflow_run(
+        portal_run_id: str,
+        orcabus_id: str,
+        state_orcabus_id: str,
+        status: str,
+        library_id_list: List[str]
+) -> Dict:
+    return {
+        "orcabusId": orcabus_id,
+        "portalRunId": portal_run_id,
+        "workflowRunName": f"umccr--automated--{WORKFLOW_NAME}--{portal_run_id}",
+        "workflow": {"name": WORKFLOW_NAME, "version": "4.4.4"},
+        "libraries": list(map(
+            lambda library_id_iter_: {"libraryId": library_id_iter_, "orcabusId": f"lib.{library_id_iter_}"},
+            library_id_list
+        )),
+        "currentState": {"orcabusId": state_orcabus_id, "status": status},
+    }
+
+
+def get_item(table, item_id: str, id_type: str) -> Optional[Dict]:
+    dynamodb_client, table_name = table
+    return dynamodb_client.get_item(
+        TableName=table_name,
+        Key={"id": {"S": item_id}, "id_type": {"S": id_type}},
+        ConsistentRead=True,
+    ).get('Item', None)
+
+
+@pytest.fixture
+def workflow_manager(monkeypatch):
+    """
+    The workflow runs returned by the (patched) Workflow Manager API, keyed by portal run id,
+    the requests made are recorded under 'requests'
+    """
+    workflow_runs: Dict[str, Dict] = {}
+    requests: List[tuple] = []
+
+    def get_workflow_run_from_portal_run_id(portal_run_id: str) -> Dict:
+        requests.append(("get_workflow_run_from_portal_run_id", portal_run_id))
+        return deepcopy(workflow_runs[portal_run_id])
+
+    monkeypatch.setattr(
+        update_workflow_run_projection, "get_workflow_run_from_portal_run_id", get_workflow_run_from_portal_run_id
+    )
+
+    return {"workflowRuns": workflow_runs, "requests": requests}
+
+
+def test_put_workflow_run_writes_run_item(workflow_run_projection_table):
+    workflow_run = get_workflow_run("20250101abcd0001", "wfr.01A", "wfs.01A1", "DRAFT", ["L1", "L2"])
+
+    assert put_workflow_run(workflow_run) is True
+
+    workflow_run_item = get_item(workflow_run_projection_table, "20250101abcd0001", WORKFLOW_RUN_ID_TYPE)
+    assert json.loads(workflow_run_item['workflow_run']['S']) == workflow_run
+    assert workflow_run_item['status']['S'] == "DRAFT"
+    assert workflow_run_item['state_orcabus_id']['S'] == "wfs.01A1"
+
+
+def test_put_workflow_run_skips_older_state(workflow_run_projection_table):
+    newer_workflow_run = get_workflow_run("20250101abcd0001", "wfr.01A", "wfs.01A2", "READY", ["L1"])
+    older_workflow_run = get_workflow_run("20250101abcd0001", "wfr.01A", "wfs.01A1", "DRAFT", ["L1"])
+
+    assert put_workflow_run(newer_workflow_run) is True
+    # An event delivered out of order
+    assert put_workflow_run(older_workflow_run) is False
+
+    workflow_run_item = get_item(workflow_run_projection_table, "20250101abcd0001", WORKFLOW_RUN_ID_TYPE)
+    assert workflow_run_item['state_orcabus_id']['S'] == "wfs.01A2"
+    assert json.loads(workflow_run_item['workflow_run']['S'])['currentState']['status'] == "READY"
+
+
+def test_put_workflow_run_same_state_is_idempotent(workflow_run_projection_table):
+    workflow_run = get_workflow_run("20250101abcd0001", "wfr.01A", "wfs.01A1", "DRAFT", ["L1"])
+
+    assert put_workflow_run(workflow_run) is True
+    # The same event delivered twice
+    assert put_workflow_run(workflow_run) is True
+
+    workflow_run_item = get_item(workflow_run_projection_table, "20250101abcd0001", WORKFLOW_RUN_ID_TYPE)
+    assert json.loads(workflow_run_item['workflow_run']['S']) == workflow_run
+
+
+def test_handler_makes_one_api_request_per_event(workflow_run_projection_table, workflow_manager):
+    workflow_run = get_workflow_run("20250101abcd0002", "wfr.01B", "wfs.01B1", "DRAFT", ["L1", "L2"])
+    workflow_manager['workflowRuns'][workflow_run['portalRunId']] = workflow_run
+
+    assert handler(
+        {"portalRunId": "20250101abcd0002", "status": "DRAFT", "workflow": {"name": WORKFLOW_NAME}},
+        None
+    ) == {"portalRunId": "20250101abcd0002", "status": "DRAFT", "isUpdated": True}
+
+    assert workflow_manager['requests'] == [("get_workflow_run_from_portal_run_id", "20250101abcd0002")]
+    assert get_item(workflow_run_projection_table, "20250101abcd0002", WORKFLOW_RUN_ID_TYPE) is not None
@@ -12,12 +12,15 @@ import {
   Genome,
   NotInBuiltInHmfReferenceGenomesType,
   PayloadVersionType,
+  SchemaSourceType,
   WorkflowVersionType,
 } from './interfaces';
 
 /* Directory constants */
 export const APP_ROOT = path.join(__dirname, '../../app');
 export const LAMBDA_DIR = path.join(APP_ROOT, 'lambdas');
+export const LAYERS_DIR = path.join(APP_ROOT, 'layers');
+export const ONCOANALYSER_TOOLS_LAYER_DIR = path.join(LAYERS_DIR, 'oncoanalyser_tools_layer');
 export const STEP_FUNCTIONS_DIR = path.join(APP_ROOT, 'step-functions-templates');
 export const EVENT_SCHEMAS_DIR = path.join(APP_ROOT, 'event-schemas');
 
@@ -171,10 +174,29 @@ export const SUCCEEDED_STATUS = 'SUCCEEDED';
 /* Schema constants */
 export const SCHEMA_REGISTRY_NAME = DATA_SCHEMA_REGISTRY_NAME;
 export const SSM_SCHEMA_ROOT = path.join(SSM_PARAMETER_PATH_PREFIX, 'schemas');
+// The registry is the source of truth, 'bundled' skips the SSM and Schemas registry calls
+// and relies on the bundled schemas being kept identical (see test/bundled-schemas.test.ts)
+export const DRAFT_SCHEMA_SOURCE: SchemaSourceType = 'registry';
 
 // Used to group event rules and step functions
 export const STACK_PREFIX = 'orca-onco-wgts-dna';
 
+/* Workflow run projection */
+// Local copy of the workflow runs of this workflow and its upstream workflow,
+// kept up to date from the WorkflowRunStateChange events (see app/lambdas/update_workflow_run_projection_py)
+export const WORKFLOW_RUN_PROJECTION_TABLE_NAME = `${STACK_PREFIX}-workflow-run-projection`;
+export const WORKFLOW_RUN_PROJECTION_WORKFLOW_NAME_LIST = [
+  WORKFLOW_NAME,
+  DRAGEN_WGTS_DNA_WORKFLOW_NAME,
+];
+
+/* Execution cache */
+// Results of the shared lookups (fastqs of a library, workflow run objects) made within a state machine execution,
+// keyed by execution arn and request hash, so each lookup is only made once per execution
+export const EXECUTION_CACHE_TABLE_NAME = `${STACK_PREFIX}-execution-cache`;
+// Long enough to outlast the fastq sync waits in the populate draft data state machine
+export const EXECUTION_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60;
+
 /* Buckets */
 export const TEST_DATA_BUCKET_NAME = TEST_DATA_BUCKET;
 export const REF_DATA_BUCKET_NAME = REFERENCE_DATA_BUCKET;
@@ -0,0 +1,60 @@
+import { Construct } from 'constructs';
+import * as dynamodb from 'aws-cdk-lib/aws-dynamodb';
+import { RemovalPolicy } from 'aws-cdk-lib';
+import { BuildExecutionCacheTableProps, BuildWorkflowRunProjectionTableProps } from './interfaces';
+
+export function buildWorkflowRunProjectionTable(
+  scope: Construct,
+  props: BuildWorkflowRunProjectionTableProps
+): dynamodb.TableV2 {
+  /**
+   * Workflow run projection table
+   *
+   * Items are keyed by id / id_type
+   *  - portal run id / 'workflow_run' - the workflow run object
+   *
+   * The table is a cache of the Workflow Manager, it can be dropped and rebuilt from the events / API
+   */
+  return new dynamodb.TableV2(scope, 'workflow-run-projection-table', {
+    tableName: props.tableName,
+    partitionKey: {
+      name: 'id',
+      type: dynamodb.AttributeType.STRING,
+    },
+    sortKey: {
+      name: 'id_type',
+      type: dynamodb.AttributeType.STRING,
+    },
+    billing: dynamodb.Billing.onDemand(),
+    pointInTimeRecoverySpecification: {
+      pointInTimeRecoveryEnabled: true,
+    },
+    removalPolicy: RemovalPolicy.RETAIN_ON_UPDATE_OR_DELETE,
+  });
+}
+
+export function buildExecutionCacheTable(
+  scope: Construct,
+  props: BuildExecutionCacheTableProps
+): dynamodb.TableV2 {
+  /**
+   * Execution cache table
+   *
+   * Items are keyed by execution_arn / request_hash, and expire (expire_at) once the execution is long done
+   * Nothing is lost if the table is dropped, the lookups are just made again
+   */
+  return new dynamodb.TableV2(scope, 'execution-cache-table', {
+    tableName: props.tableName,
+    partitionKey: {
+      name: 'execution_arn',
+      type: dynamodb.AttributeType.STRING,
+    },
+    sortKey: {
+      name: 'request_hash',
+      type: dynamodb.AttributeType.STRING,
+    },
+    timeToLiveAttribute: 'expire_at',
+    billing: dynamodb.Billing.onDemand(),
+    removalPolicy: RemovalPolicy.DESTROY,
+  });
+}
@@ -0,0 +1,10 @@
+/**
+ * DynamoDB Interfaces
+ */
+export interface BuildWorkflowRunProjectionTableProps {
+  tableName: string;
+}
+
+export interface BuildExecutionCacheTableProps {
+  tableName: string;
+}
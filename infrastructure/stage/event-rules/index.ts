@@ -3,6 +3,7 @@ import {
   BuildDraftRuleProps,
   BuildReadyRuleProps,
   BuildIcav2AnalysisStateChangeRuleProps,
+  BuildWorkflowRunProjectionRuleProps,
   eventBridgeRuleNameList,
   EventBridgeRuleObject,
   EventBridgeRuleProps,
@@ -21,6 +22,7 @@ import {
   SUCCEEDED_STATUS,
   WORKFLOW_MANAGER_EVENT_SOURCE,
   WORKFLOW_NAME,
+  WORKFLOW_RUN_PROJECTION_WORKFLOW_NAME_LIST,
   WORKFLOW_RUN_STATE_CHANGE_DETAIL_TYPE,
 } from '../constants';
 import { payloadVersionList } from '../interfaces';
@@ -87,6 +89,19 @@ function buildWorkflowManagerReadyEventPattern(): EventPattern {
   };
 }
 
+function buildWorkflowRunProjectionEventPattern(): EventPattern {
+  // Every state change of this workflow and the upstream workflow
+  return {
+    detailType: [WORKFLOW_RUN_STATE_CHANGE_DETAIL_TYPE],
+    source: [WORKFLOW_MANAGER_EVENT_SOURCE],
+    detail: {
+      workflow: {
+        name: WORKFLOW_RUN_PROJECTION_WORKFLOW_NAME_LIST,
+      },
+    },
+  };
+}
+
 function buildEventRule(scope: Construct, props: EventBridgeRuleProps): Rule {
   return new events.Rule(scope, props.ruleName, {
     ruleName: `${STACK_PREFIX}--${props.ruleName}`,
@@ -139,6 +154,17 @@ function buildWorkflowRunStateChangeReadyEventRule(
   });
 }
 
+function buildWorkflowRunStateChangeProjectionEventRule(
+  scope: Construct,
+  props: BuildWorkflowRunProjectionRuleProps
+): Rule {
+  return buildEventRule(scope, {
+    ruleName: props.ruleName,
+    eventPattern: buildWorkflowRunProjectionEventPattern(),
+    eventBus: props.eventBus,
+  });
+}
+
 export function buildAllEventRules(
   scope: Construct,
   props: EventBridgeRulesProps
@@ -190,6 +216,17 @@ export function buildAllEventRules(
             eventBus: props.eventBus,
           }),
         });
+        break;
+      }
+      // Workflow run projection
+      case 'wrscWorkflowRunProjection': {
+        eventBridgeRuleObjects.push({
+          ruleName: ruleName,
+          ruleObject: buildWorkflowRunStateChangeProjectionEventRule(scope, {
+            ruleName: ruleName,
+            eventBus: props.eventBus,
+          }),
+        });
       }
     }
   }
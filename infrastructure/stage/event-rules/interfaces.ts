@@ -11,7 +11,9 @@ export type EventBridgeRuleName =
   // Pre-ready
   | 'wrscReady'
   // Post-submitted
-  | 'icav2WesAnalysisStateChange';
+  | 'icav2WesAnalysisStateChange'
+  // Workflow run projection
+  | 'wrscWorkflowRunProjection';
 
 export const eventBridgeRuleNameList: EventBridgeRuleName[] = [
   // Upstream Succeeded (Dragen WGTS DNA)
@@ -22,6 +24,8 @@ export const eventBridgeRuleNameList: EventBridgeRuleName[] = [
   'wrscReady',
   // Post-submitted
   'icav2WesAnalysisStateChange',
+  // Workflow run projection
+  'wrscWorkflowRunProjection',
 ];
 
 export interface EventBridgeRuleProps {
@@ -42,3 +46,4 @@ export interface EventBridgeRuleObject {
 export type BuildIcav2AnalysisStateChangeRuleProps = Omit<EventBridgeRuleProps, 'eventPattern'>;
 export type BuildDraftRuleProps = Omit<EventBridgeRuleProps, 'eventPattern'>;
 export type BuildReadyRuleProps = Omit<EventBridgeRuleProps, 'eventPattern'>;
+export type BuildWorkflowRunProjectionRuleProps = Omit<EventBridgeRuleProps, 'eventPattern'>;
@@ -1,4 +1,5 @@
 import {
+  AddLambdaAsEventBridgeTargetProps,
   AddSfnAsEventBridgeTargetProps,
   eventBridgeTargetsNameList,
   EventBridgeTargetsProps,
@@ -27,6 +28,16 @@ export function buildIcav2WesEventStateChangeToWrscSfnTarget(
   );
 }
 
+export function buildWrscToLambdaTarget(props: AddLambdaAsEventBridgeTargetProps) {
+  // We take in the event detail from the workflow run state change event
+  // And return the entire detail to the lambda function
+  props.eventBridgeRuleObj.addTarget(
+    new eventsTargets.LambdaFunction(props.lambdaFunction, {
+      event: events.RuleTargetInput.fromEventPath('$.detail'),
+    })
+  );
+}
+
 export function buildAllEventBridgeTargets(props: EventBridgeTargetsProps) {
   for (const eventBridgeTargetsName of eventBridgeTargetsNameList) {
     switch (eventBridgeTargetsName) {
@@ -94,6 +105,19 @@ export function buildAllEventBridgeTargets(props: EventBridgeTargetsProps) {
         });
         break;
       }
+
+      // Workflow run projection
+      case 'wrscToUpdateWorkflowRunProjectionLambdaTarget': {
+        buildWrscToLambdaTarget(<AddLambdaAsEventBridgeTargetProps>{
+          eventBridgeRuleObj: props.eventBridgeRuleObjects.find(
+            (eventBridgeObject) => eventBridgeObject.ruleName === 'wrscWorkflowRunProjection'
+          )?.ruleObject,
+          lambdaFunction: props.lambdaObjects.find(
+            (lambdaObject) => lambdaObject.lambdaName === 'updateWorkflowRunProjection'
+          )?.lambdaFunction,
+        });
+        break;
+      }
     }
   }
 }
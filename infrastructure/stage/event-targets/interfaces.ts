@@ -2,6 +2,8 @@ import { StateMachine } from 'aws-cdk-lib/aws-stepfunctions';
 import { Rule } from 'aws-cdk-lib/aws-events';
 import { EventBridgeRuleObject } from '../event-rules/interfaces';
 import { StepFunctionObject } from '../step-functions/interfaces';
+import { LambdaObject } from '../lambda/interfaces';
+import { PythonUvFunction } from '@orcabus/platform-cdk-constructs/lambda';
 
 /**
  * EventBridge Target Interfaces
@@ -16,7 +18,9 @@ export type EventBridgeTargetName =
   // Ready to ICAv2 WES Submitted
   | 'readyToIcav2WesSubmittedSfnTarget'
   // Post submission
-  | 'icav2WesAnalysisStateChangeEventToWrscSfnTarget';
+  | 'icav2WesAnalysisStateChangeEventToWrscSfnTarget'
+  // Workflow run projection
+  | 'wrscToUpdateWorkflowRunProjectionLambdaTarget';
 
 export const eventBridgeTargetsNameList: EventBridgeTargetName[] = [
   // Dragen WGTS Succeeded
@@ -29,6 +33,8 @@ export const eventBridgeTargetsNameList: EventBridgeTargetName[] = [
   'readyToIcav2WesSubmittedSfnTarget',
   // Post submission
   'icav2WesAnalysisStateChangeEventToWrscSfnTarget',
+  // Workflow run projection
+  'wrscToUpdateWorkflowRunProjectionLambdaTarget',
 ];
 
 export interface AddSfnAsEventBridgeTargetProps {
@@ -36,7 +42,13 @@ export interface AddSfnAsEventBridgeTargetProps {
   eventBridgeRuleObj: Rule;
 }
 
+export interface AddLambdaAsEventBridgeTargetProps {
+  lambdaFunction: PythonUvFunction;
+  eventBridgeRuleObj: Rule;
+}
+
 export interface EventBridgeTargetsProps {
   eventBridgeRuleObjects: EventBridgeRuleObject[];
   stepFunctionObjects: StepFunctionObject[];
+  lambdaObjects: LambdaObject[];
 }
@@ -36,6 +36,10 @@ export interface StatelessApplicationStackConfig {
 /* Set payload versions */
 export type PayloadVersionType = '2025.08.05' | '2026.04.16';
 
+/* Where the validation lambdas read the complete-data-draft schemas from */
+/* 'bundled' uses the copies packaged with each lambda, 'registry' uses SSM + the Schemas registry */
+export type SchemaSourceType = 'bundled' | 'registry';
+
 /* Set workflow versions */
 export type WorkflowVersionType = '2.0.0' | '2.1.0' | '2.2.0' | '2.3.0';
 
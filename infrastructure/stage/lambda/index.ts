@@ -1,14 +1,24 @@
-import { LambdaInput, lambdaNameList, LambdaObject, lambdaRequirementsMap } from './interfaces';
+import {
+  BuildLambdaProps,
+  lambdaNameList,
+  LambdaObject,
+  lambdaRequirementsMap,
+} from './interfaces';
 import { PythonUvFunction } from '@orcabus/platform-cdk-constructs/lambda';
 import {
   DEFAULT_PAYLOAD_VERSION,
   DEFAULT_WORKFLOW_VERSION,
+  DRAFT_SCHEMA_SOURCE,
+  EXECUTION_CACHE_TABLE_NAME,
+  EXECUTION_CACHE_TTL_SECONDS,
   LAMBDA_DIR,
+  ONCOANALYSER_TOOLS_LAYER_DIR,
   SCHEMA_REGISTRY_NAME,
   SSM_SCHEMA_ROOT,
   TEST_DATA_BUCKET_NAME,
   REF_DATA_BUCKET_NAME,
   WORKFLOW_NAME,
+  WORKFLOW_RUN_PROJECTION_TABLE_NAME,
 } from '../constants';
 import { REPO_NAME } from '../../toolchain/constants';
 import * as lambda from 'aws-cdk-lib/aws-lambda';
@@ -21,7 +31,7 @@ import { camelCaseToKebabCase, camelCaseToSnakeCase } from '../utils';
 import * as path from 'path';
 import { SchemaNames } from '../event-schemas/interfaces';
 
-function buildLambda(scope: Construct, props: LambdaInput): LambdaObject {
+function buildLambda(scope: Construct, props: BuildLambdaProps): LambdaObject {
   const lambdaNameToSnakeCase = camelCaseToSnakeCase(props.lambdaName);
   const lambdaRequirements = lambdaRequirementsMap[props.lambdaName];
 
@@ -39,6 +49,13 @@ function buildLambda(scope: Construct, props: LambdaInput): LambdaObject {
     includeIcav2Layer: lambdaRequirements.needsIcav2Tools,
   });
 
+  /*
+    Helpers shared between the lambdas of this service
+    */
+  if (lambdaRequirements.needsOncoanalyserTools) {
+    lambdaFunction.addLayers(props.oncoanalyserToolsLayer);
+  }
+
   // AwsSolutions-L1 - Python 3.14 is not yet in the cdk-nag approved list but is our target runtime
   // AwsSolutions-IAM4 - Basic execution role provides CloudWatch Logs permissions needed by all Lambdas
   NagSuppressions.addResourceSuppressions(
@@ -125,6 +142,10 @@ function buildLambda(scope: Construct, props: LambdaInput): LambdaObject {
     Add DEFAULT_PAYLOAD_VERSION env var too
     */
     lambdaFunction.addEnvironment('DEFAULT_PAYLOAD_VERSION', DEFAULT_PAYLOAD_VERSION);
+    /*
+    Read the schemas from the registry, or opt in to the copies bundled with the lambda
+    */
+    lambdaFunction.addEnvironment('SCHEMA_SOURCE', DRAFT_SCHEMA_SOURCE);
   }
 
   /*
@@ -154,6 +175,48 @@ function buildLambda(scope: Construct, props: LambdaInput): LambdaObject {
     );
   }
 
+  /*
+  Workflow run projection, readers fall back to the Workflow Manager API on a miss
+   */
+  if (
+    lambdaRequirements.needsWorkflowRunProjectionReadAccess ||
+    lambdaRequirements.needsWorkflowRunProjectionWriteAccess
+  ) {
+    lambdaFunction.addToRolePolicy(
+      new iam.PolicyStatement({
+        actions: lambdaRequirements.needsWorkflowRunProjectionWriteAccess
+          ? ['dynamodb:GetItem', 'dynamodb:PutItem']
+          : ['dynamodb:GetItem'],
+        resources: [
+          `arn:aws:dynamodb:${cdk.Aws.REGION}:${cdk.Aws.ACCOUNT_ID}:table/${WORKFLOW_RUN_PROJECTION_TABLE_NAME}`,
+        ],
+      })
+    );
+    lambdaFunction.addEnvironment(
+      'WORKFLOW_RUN_PROJECTION_TABLE_NAME',
+      WORKFLOW_RUN_PROJECTION_TABLE_NAME
+    );
+  }
+
+  /*
+  Execution cache, shared lookups are made once per state machine execution
+   */
+  if (lambdaRequirements.needsExecutionCache) {
+    lambdaFunction.addToRolePolicy(
+      new iam.PolicyStatement({
+        actions: ['dynamodb:GetItem', 'dynamodb:PutItem'],
+        resources: [
+          `arn:aws:dynamodb:${cdk.Aws.REGION}:${cdk.Aws.ACCOUNT_ID}:table/${EXECUTION_CACHE_TABLE_NAME}`,
+        ],
+      })
+    );
+    lambdaFunction.addEnvironment('EXECUTION_CACHE_TABLE_NAME', EXECUTION_CACHE_TABLE_NAME);
+    lambdaFunction.addEnvironment(
+      'EXECUTION_CACHE_TTL_SECONDS',
+      EXECUTION_CACHE_TTL_SECONDS.toString()
+    );
+  }
+
   /* Return the function */
   return {
     lambdaName: props.lambdaName,
@@ -161,13 +224,27 @@ function buildLambda(scope: Construct, props: LambdaInput): LambdaObject {
   };
 }
 
+function buildOncoanalyserToolsLayer(scope: Construct): lambda.ILayerVersion {
+  // Pure python, no dependencies to bundle
+  return new lambda.LayerVersion(scope, 'oncoanalyserToolsLayer', {
+    code: lambda.Code.fromAsset(ONCOANALYSER_TOOLS_LAYER_DIR),
+    compatibleRuntimes: [lambda.Runtime.PYTHON_3_14],
+    compatibleArchitectures: [lambda.Architecture.ARM_64],
+    description: 'Helpers shared between the oncoanalyser wgts dna lambdas',
+  });
+}
+
 export function buildAllLambdas(scope: Construct): LambdaObject[] {
+  // Build the shared layer once
+  const oncoanalyserToolsLayer = buildOncoanalyserToolsLayer(scope);
+
   // Iterate over lambdaLayerToMapping and create the lambda functions
   const lambdaObjects: LambdaObject[] = [];
   for (const lambdaName of lambdaNameList) {
     lambdaObjects.push(
       buildLambda(scope, {
         lambdaName: lambdaName,
+        oncoanalyserToolsLayer: oncoanalyserToolsLayer,
       })
     );
   }
@@ -1,4 +1,5 @@
 import { PythonUvFunction } from '@orcabus/platform-cdk-constructs/lambda';
+import { ILayerVersion } from 'aws-cdk-lib/aws-lambda';
 
 export type LambdaName =
   // Shared pre-ready lambdas
@@ -10,7 +11,6 @@ export type LambdaName =
   | 'generateWruEventObjectWithMergedData'
   | 'getLatestPayloadFromPortalRunId'
   | 'getAnalysisStorageSizeFromBasecountEst'
-  | 'getMissingSchemaFields'
   // Glue lambdas
   // Draft Builder lambdas
   | 'getFastqIdListFromRgidList'
@@ -30,9 +30,12 @@ export type LambdaName =
   | 'convertReadyEventInputsToIcav2WesEventInputs'
   | 'determineFastqCompressionType'
   | 'generateFastqUriByFastqIdMap'
+  | 'findCachedOraOutputs'
   | 'collectOraOutputs'
   // ICAv2 WES to WRSC Event lambdas
-  | 'convertIcav2WesEventToWrscEvent';
+  | 'convertIcav2WesEventToWrscEvent'
+  // Workflow run projection lambdas
+  | 'updateWorkflowRunProjection';
 
 export const lambdaNameList: LambdaName[] = [
   // Shared pre-ready lambdas
@@ -44,7 +47,6 @@ export const lambdaNameList: LambdaName[] = [
   'generateWruEventObjectWithMergedData',
   'getLatestPayloadFromPortalRunId',
   'getAnalysisStorageSizeFromBasecountEst',
-  'getMissingSchemaFields',
   // Glue lambdas
   // Draft Builder lambdas
   'getFastqIdListFromRgidList',
@@ -63,22 +65,29 @@ export const lambdaNameList: LambdaName[] = [
   'convertReadyEventInputsToIcav2WesEventInputs',
   'determineFastqCompressionType',
   'generateFastqUriByFastqIdMap',
+  'findCachedOraOutputs',
   'collectOraOutputs',
   // ICAv2 WES to WRSC Event lambdas
   'convertIcav2WesEventToWrscEvent',
   'addWesFailureComment',
+  // Workflow run projection lambdas
+  'updateWorkflowRunProjection',
 ];
 
 // Requirements interface for Lambda functions
 export interface LambdaRequirements {
   needsOrcabusApiTools?: boolean;
   needsIcav2Tools?: boolean;
+  needsOncoanalyserTools?: boolean;
   needsHigherMemory?: boolean;
   needsSsmParametersAccess?: boolean;
   needsSchemaRegistryAccess?: boolean;
   needsExternalBucketInfo?: boolean;
   needsWorkflowInfo?: boolean;
   needsRepoUrl?: boolean;
+  needsWorkflowRunProjectionReadAccess?: boolean;
+  needsWorkflowRunProjectionWriteAccess?: boolean;
+  needsExecutionCache?: boolean;
 }
 
 // Lambda requirements mapping
@@ -105,15 +114,14 @@ export const lambdaRequirementsMap: Record<LambdaName, LambdaRequirements> = {
   },
   getAnalysisStorageSizeFromBasecountEst: {
     needsOrcabusApiTools: true,
-  },
-  getMissingSchemaFields: {
-    needsSchemaRegistryAccess: true,
-    needsSsmParametersAccess: true,
+    needsOncoanalyserTools: true,
   },
   // Glue lambdas
   // Draft Builder lambdas
   getFastqIdListFromRgidList: {
     needsOrcabusApiTools: true,
+    needsExecutionCache: true,
+    needsOncoanalyserTools: true,
   },
   getFastqRgidsFromLibraryId: {
     needsOrcabusApiTools: true,
@@ -127,10 +135,12 @@ export const lambdaRequirementsMap: Record<LambdaName, LambdaRequirements> = {
   getPrefixFromProjectId: {
     needsOrcabusApiTools: true,
     needsIcav2Tools: true,
+    needsOncoanalyserTools: true,
   },
   getFastqListRowsFromFastqRgidList: {
     needsOrcabusApiTools: true,
     needsExternalBucketInfo: true,
+    needsOncoanalyserTools: true,
   },
   // Validate Draft Complete schema
   postSchemaValidation: {
@@ -138,6 +148,7 @@ export const lambdaRequirementsMap: Record<LambdaName, LambdaRequirements> = {
     needsWorkflowInfo: true,
     needsExternalBucketInfo: true,
     needsIcav2Tools: true,
+    needsOncoanalyserTools: true,
   },
   validateDraftDataCompleteSchema: {
     needsOrcabusApiTools: true,
@@ -163,18 +174,33 @@ export const lambdaRequirementsMap: Record<LambdaName, LambdaRequirements> = {
   determineFastqCompressionType: {},
   generateFastqUriByFastqIdMap: {
     needsOrcabusApiTools: true,
+    needsOncoanalyserTools: true,
+  },
+  findCachedOraOutputs: {
+    needsOrcabusApiTools: true,
   },
   collectOraOutputs: {
     needsOrcabusApiTools: true,
+    needsOncoanalyserTools: true,
   },
   // Needs OrcaBus toolkit to get the wrsc event
   convertIcav2WesEventToWrscEvent: {
     needsOrcabusApiTools: true,
     needsWorkflowInfo: true,
+    needsWorkflowRunProjectionReadAccess: true,
+    needsOncoanalyserTools: true,
   },
   addWesFailureComment: {
     needsOrcabusApiTools: true,
     needsWorkflowInfo: true,
+    needsWorkflowRunProjectionReadAccess: true,
+    needsOncoanalyserTools: true,
+  },
+  // Consumes the WorkflowRunStateChange events to keep the projection up to date
+  updateWorkflowRunProjection: {
+    needsOrcabusApiTools: true,
+    needsOncoanalyserTools: true,
+    needsWorkflowRunProjectionWriteAccess: true,
   },
 };
 
@@ -182,6 +208,10 @@ export interface LambdaInput {
   lambdaName: LambdaName;
 }
 
+export interface BuildLambdaProps extends LambdaInput {
+  oncoanalyserToolsLayer: ILayerVersion;
+}
+
 export interface LambdaObject extends LambdaInput {
   lambdaFunction: PythonUvFunction;
 }
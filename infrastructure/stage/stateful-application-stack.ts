@@ -3,6 +3,8 @@ import { Construct } from 'constructs';
 import { StatefulApplicationStackConfig } from './interfaces';
 import { buildSsmParameters } from './ssm';
 import { buildSchemas } from './event-schemas';
+import { buildExecutionCacheTable, buildWorkflowRunProjectionTable } from './dynamodb';
+import { EXECUTION_CACHE_TABLE_NAME, WORKFLOW_RUN_PROJECTION_TABLE_NAME } from './constants';
 import { GitStack } from '@orcabus/platform-cdk-constructs/deployment-stack-pipeline';
 
 export type StatefulApplicationStackProps = cdk.StackProps & StatefulApplicationStackConfig;
@@ -25,5 +27,15 @@ export class StatefulApplicationStack extends GitStack {
 
     // Add to the schema registry
     buildSchemas(this);
+
+    // Build the workflow run projection table
+    buildWorkflowRunProjectionTable(this, {
+      tableName: WORKFLOW_RUN_PROJECTION_TABLE_NAME,
+    });
+
+    // Build the execution cache table
+    buildExecutionCacheTable(this, {
+      tableName: EXECUTION_CACHE_TABLE_NAME,
+    });
   }
 }
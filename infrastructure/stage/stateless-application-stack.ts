@@ -51,6 +51,7 @@ export class StatelessApplicationStack extends GitStack {
     buildAllEventBridgeTargets({
       eventBridgeRuleObjects: eventRules,
       stepFunctionObjects: stateMachines,
+      lambdaObjects: lambdas,
     });
   }
 }
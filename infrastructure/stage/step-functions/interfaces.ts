@@ -103,7 +103,6 @@ export const stepFunctionToLambdasMap: Record<StateMachineName, LambdaName[]> =
     'generateWruEventObjectWithMergedData',
     'getLatestPayloadFromPortalRunId',
     'getAnalysisStorageSizeFromBasecountEst',
-    'getMissingSchemaFields',
     // Draft Builder lambdas
     'getFastqIdListFromRgidList',
     'getFastqRgidsFromLibraryId',
@@ -123,6 +122,7 @@ export const stepFunctionToLambdasMap: Record<StateMachineName, LambdaName[]> =
     'determineFastqCompressionType',
     'getFastqIdListFromRgidList',
     'generateFastqUriByFastqIdMap',
+    'findCachedOraOutputs',
     'collectOraOutputs',
   ],
   icav2WesEventToWrscEvent: ['convertIcav2WesEventToWrscEvent', 'addWesFailureComment'],
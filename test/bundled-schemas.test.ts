@@ -0,0 +1,45 @@
+import * as fs from 'fs';
+import * as path from 'path';
+import { EVENT_SCHEMAS_DIR, LAMBDA_DIR } from '../infrastructure/stage/constants';
+import { payloadVersionList } from '../infrastructure/stage/interfaces';
+import { camelCaseToKebabCase, camelCaseToSnakeCase } from '../infrastructure/stage/utils';
+import { lambdaNameList, lambdaRequirementsMap } from '../infrastructure/stage/lambda/interfaces';
+import { schemaNamesList } from '../infrastructure/stage/event-schemas/interfaces';
+
+/*
+Lambdas with schema registry access fall back to a bundled copy of each schema,
+make sure those copies have not drifted from the registered schemas
+*/
+describe('bundled-lambda-schemas', () => {
+  const schemaLambdaNames = lambdaNameList.filter(
+    (lambdaName) => lambdaRequirementsMap[lambdaName].needsSchemaRegistryAccess
+  );
+
+  for (const lambdaName of schemaLambdaNames) {
+    for (const schemaName of schemaNamesList) {
+      const kebabCaseSchemaName = camelCaseToKebabCase(schemaName);
+      for (const payloadVersion of payloadVersionList) {
+        test(`${lambdaName} bundles ${schemaName} ${payloadVersion}`, () => {
+          const schemaFileName = `${kebabCaseSchemaName}-schema.json`;
+          const registeredSchemaPath = path.join(
+            EVENT_SCHEMAS_DIR,
+            kebabCaseSchemaName,
+            payloadVersion,
+            schemaFileName
+          );
+          const bundledSchemaPath = path.join(
+            LAMBDA_DIR,
+            camelCaseToSnakeCase(lambdaName) + '_py',
+            'schemas',
+            kebabCaseSchemaName,
+            payloadVersion,
+            schemaFileName
+          );
+          expect(fs.readFileSync(bundledSchemaPath, 'utf-8')).toEqual(
+            fs.readFileSync(registeredSchemaPath, 'utf-8')
+          );
+        });
+      }
+    }
+  }
+});